@@ -1,5 +1,7 @@
+from multiprocessing import freeze_support
 from scripts.game import Game
 
 if __name__ == "__main__":
+    freeze_support()
     game = Game()
     game.loop()
\ No newline at end of file
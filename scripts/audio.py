@@ -10,6 +10,12 @@ class Audio:
         
         self._sounds[name] = pygame.mixer.Sound(path)
 
+    def add(self, name: str, sound: pygame.mixer.Sound) -> None:
+        if name in self._sounds:
+            return
+        
+        self._sounds[name] = sound
+
     def play(self, name: str, loop: int = 0) -> None:
         if name in self._sounds:
             self._sounds[name].play(loop)
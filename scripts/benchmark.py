@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import argparse
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from scripts.game import Game
+from scripts.image import convert_surface
+from scripts.objects import QuizMenuBubble, QuizButtonBubble
+from scripts.utils import asset_path, get_files_from
+import scripts.settings as settings
+
+class FrameStats:
+    def __init__(self) -> None:
+        self._samples: dict[str, dict[str, list[float]]] = {}
+
+    def add(self, scene: str, phase: str, seconds: float) -> None:
+        self._samples.setdefault(scene, {}).setdefault(phase, []).append(seconds * 1000)
+
+    @staticmethod
+    def percentile(samples: list[float], percent: float) -> float:
+        ordered = sorted(samples)
+        index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def report(self) -> dict:
+        report = {}
+        for scene, phases in self._samples.items():
+            report[scene] = {}
+            for phase, samples in phases.items():
+                report[scene][phase] = {
+                    "frames": len(samples),
+                    "p50": self.percentile(samples, 50),
+                    "p95": self.percentile(samples, 95),
+                    "p99": self.percentile(samples, 99),
+                }
+        return report
+
+class Benchmark:
+    """
+    Прогоняет игру без окна и звука: Intro -> Menu -> Quiz -> экран результатов.
+    Ввод подаётся через очередь событий pygame, поэтому проходит обычный путь Input.update.
+    """
+    def __init__(self, frames: int = 300, answer_every: int = 30) -> None:
+        self._frames = frames
+        self._answer_every = answer_every
+        self._delta = 1 / settings.FPS
+        self._stats = FrameStats()
+        self.game = Game()
+
+    def _frame(self) -> None:
+        scene = type(self.game.scene).__name__
+        if scene == "Quiz" and self.game.scene._ended:
+            scene = "QuizEnd"
+
+        t0 = perf_counter()
+        self.game.update(self._delta)
+        t1 = perf_counter()
+        self.game.render()
+        t2 = perf_counter()
+        self.game.handle_events()
+
+        self._stats.add(scene, "update", t1 - t0)
+        self._stats.add(scene, "render", t2 - t1)
+
+    def _press_key(self, key: int) -> None:
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+
+    def _click(self, position: tuple[int, int]) -> None:
+        pygame.mouse.set_pos(position)
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=position))
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=position))
+
+    def _find_sprite(self, sprite_type: type) -> pygame.sprite.Sprite:
+        for sprite in self.game.scene.objects.sprites():
+            if type(sprite) == sprite_type:
+                return sprite
+
+    def _run_intro(self) -> None:
+        for _ in range(self._frames):
+            self._frame()
+        while type(self.game.scene).__name__ == "Intro":
+            self._press_key(pygame.K_SPACE)
+            self._frame()
+
+    def _run_menu(self) -> None:
+        for _ in range(self._frames):
+            self._frame()
+        bubble = self._find_sprite(QuizMenuBubble)
+        if bubble is None:
+            raise RuntimeError("no quizzes found in data/")
+        while type(self.game.scene).__name__ == "Menu":
+            self._click(bubble.rect.center)
+            self._frame()
+
+    def _run_quiz(self) -> None:
+        frame = 0
+        while not self.game.scene._ended:
+            frame += 1
+            if frame % self._answer_every == 0:
+                self._click(self._find_sprite(QuizButtonBubble).rect.center)
+            self._frame()
+        for _ in range(self._frames):
+            self._frame()
+
+    def run(self) -> dict:
+        self._run_intro()
+        self._run_menu()
+        self._run_quiz()
+        return self._stats.report()
+
+def blit_benchmark(game: Game, blits: int = 2000) -> dict:
+    """
+    Сравнит время blit на экран для изображений в исходном формате и после convert_surface.
+    Исходные изображения берутся так, как их раньше хранил Image: после load и set_colorkey.
+    """
+    game.loader.finish()
+    images = {}
+    for file in sorted(get_files_from(asset_path(settings.IMAGES_DIR))):
+        if file.endswith(".png"):
+            image = pygame.image.load(asset_path(f"{settings.IMAGES_DIR}{file}"))
+            image.set_colorkey((0, 0, 0))
+            images[file] = image
+
+    for name in ("quiz_bubble_idle", "quiz_bubble_input", "quiz_next_question_idle"):
+        bubble = game.image.get(name)[0]
+        image = pygame.Surface(bubble.get_size())
+        image.blit(bubble, (0, 0))
+        image.set_colorkey((0, 0, 0))
+        images[name] = image
+
+    def _measure(image: pygame.Surface) -> float:
+        t0 = perf_counter()
+        for _ in range(blits):
+            game.screen.blit(image, (0, 0))
+        return (perf_counter() - t0) / blits * 1e6
+
+    report = {}
+    for name, image in images.items():
+        raw = _measure(image)
+        converted = _measure(convert_surface(image))
+        report[name] = {"raw": raw, "converted": converted, "speedup": raw / converted}
+    return report
+
+def print_blit_report(report: dict) -> None:
+    print(f"{'image':<26}{'raw us':>10}{'conv us':>10}{'speedup':>10}")
+    for name, stats in report.items():
+        print(f"{name:<26}{stats['raw']:>10.2f}{stats['converted']:>10.2f}{stats['speedup']:>9.1f}x")
+
+def print_report(report: dict) -> None:
+    print(f"{'scene':<10}{'phase':<8}{'frames':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for scene, phases in report.items():
+        for phase, stats in phases.items():
+            print(f"{scene:<10}{phase:<8}{stats['frames']:>8}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}")
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless frame time benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="frames to record on each screen")
+    parser.add_argument("--answer-every", type=int, default=30, help="frames between Next clicks in a quiz")
+    parser.add_argument("--blits", type=int, default=0, help="instead measure this many blits per image, raw vs display format")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.blits:
+        report = blit_benchmark(Game(), args.blits)
+        print_blit_report(report)
+    else:
+        report = Benchmark(args.frames, args.answer_every).run()
+        print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=4)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,4 +1,116 @@
+import io
 import pygame
+from collections import OrderedDict
+
+class FontCache:
+    def __init__(self) -> None:
+        self._fonts: dict[tuple, pygame.font.Font] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, fontpath: str, size: int, align: int, data: bytes = None) -> pygame.font.Font:
+        """
+        Вернёт общий для всего процесса объект шрифта.
+        Файл шрифта открывается и разбирается только при первом обращении,
+        если передан data, шрифт создаётся из этих уже прочитанных байтов файла.
+        Вызывать только из главного потока.
+        """
+        key = (fontpath, size, align)
+        if key in self._fonts:
+            self._hits += 1
+            return self._fonts[key]
+
+        self._misses += 1
+        font = pygame.font.Font(fontpath if data is None else io.BytesIO(data), size)
+        font.align = align
+        self._fonts[key] = font
+        return font
+
+    def clear(self) -> None:
+        self._fonts.clear()
+        self._hits = 0
+        self._misses = 0
+
+class RenderCache:
+    def __init__(self, budget: int = 16 * 1024 * 1024) -> None:
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._budget = budget
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: int) -> None:
+        self._budget = value
+        self._evict()
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def get(self, key: tuple) -> pygame.Surface | None:
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._surfaces.move_to_end(key)
+        return surface
+
+    def add(self, key: tuple, surface: pygame.Surface) -> None:
+        size = self._get_surface_bytes(surface)
+        if size > self._budget:
+            return
+        if key in self._surfaces:
+            self._bytes -= self._get_surface_bytes(self._surfaces.pop(key))
+        self._surfaces[key] = surface
+        self._bytes += size
+        self._evict()
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _evict(self) -> None:
+        while self._bytes > self._budget and self._surfaces:
+            _key, surface = self._surfaces.popitem(last=False)
+            self._bytes -= self._get_surface_bytes(surface)
+            self._evictions += 1
+
+    @staticmethod
+    def _get_surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+font_cache = FontCache()
+render_cache = RenderCache()
 
 class FontParams:
     def __init__(self, 
@@ -17,7 +129,17 @@ class FontParams:
         self._wraplength = wraplength
 
     def get_render(self, text: str) -> pygame.Surface:
-        return self.get_font().render(text, self._alias, self._color, wraplength=self._wraplength)
+        """
+        Вернёт изображение текста из общего кэша.
+        Изображение разделяется между всеми вызовами, поэтому изменять его нельзя:
+        если нужна прозрачность или рисование поверх, сделайте copy().
+        """
+        key = (text, self._fontpath, self._size, self._align, self._alias, self._color, self._wraplength)
+        surface = render_cache.get(key)
+        if surface is None:
+            surface = self.get_font().render(text, self._alias, self._color, wraplength=self._wraplength)
+            render_cache.add(key, surface)
+        return surface
 
     def get_font_size(self, text: str) -> tuple[int, int]:
         """
@@ -26,10 +148,12 @@ class FontParams:
         """
         return self.get_font().size(text)
 
-    def get_font(self) -> pygame.font.Font:
-        font = pygame.font.Font(self._fontpath, self._size)
-        font.align = self._align
-        return font
+    @property
+    def fontpath(self) -> str:
+        return self._fontpath
+
+    def get_font(self, data: bytes = None) -> pygame.font.Font:
+        return font_cache.get(self._fontpath, self._size, self._align, data)
 
 class Font:
     none = FontParams()
@@ -3,8 +3,10 @@ import pygame
 from scripts.questio import draw_quiz_bubbles
 from scripts.audio import Audio
 from scripts.image import Image
-from scripts.font import Font
+from scripts.font import Font, render_cache
 from scripts.input import Input
+from scripts.loader import AssetLoader
+from scripts.profiler import Profiler
 import scripts.settings as settings
 import scripts.scenes as scenes
 
@@ -17,25 +19,50 @@ class Game:
         self.audio = Audio()
         self.image = Image()
         self.font = Font()
+        render_cache.budget = settings.TEXT_CACHE_BUDGET
         self.input = Input()
+        self.profiler = Profiler()
+        self.loader = AssetLoader(self)
         self.init_scenes()
-        draw_quiz_bubbles(self)
 
     def init_scenes(self) -> None:
+        """
+        Сцена создаётся при первом переходе на неё или заранее, через preload.
+        Сразу создаётся только первая сцена, чтобы она начала рисоваться, пока грузятся ресурсы и пузыри.
+        """
         self.scene = None
         self.scenes = {}
+        self._preload: list[str] = []
+
+        self.change_scene(scenes.__all__[0])
+        draw_quiz_bubbles(self)
 
-        for scene in map(scenes.__dict__.get, scenes.__all__):
-            self.scenes[scene.__name__] = scene(self)
+    def preload(self, name: str) -> None:
+        """
+        Создаст сцену name в одном из следующих кадров после окончания загрузки ресурсов,
+        чтобы переход на неё не ждал её ready().
+        """
+        if name in scenes.__all__ and name not in self.scenes and name not in self._preload:
+            self._preload.append(name)
 
-        first_scene = list(self.scenes.keys())[0]
-        self.change_scene(first_scene)
+    def _load_scene(self, name: str) -> scenes.Scene:
+        if name not in self.scenes:
+            self.loader.finish()
+            self.scenes[name] = scenes.__dict__[name](self)
+        if name in self._preload:
+            self._preload.remove(name)
+        return self.scenes[name]
+
+    def _run_preload(self) -> None:
+        if self._preload and self.loader.done:
+            self._load_scene(self._preload[0])
 
     def change_scene(self, name: str, *args) -> None:
-        if name in self.scenes.keys():
+        if name in scenes.__all__:
             if self.scene:
                 self.scene.onExit()
-            self.scene = self.scenes[name]
+            self.scene = self._load_scene(name)
+            self.scene.redraw()
             self.scene.onEnter(*args)
 
     def quit(self) -> None:
@@ -50,20 +77,45 @@ class Game:
             self.handle_events()
     
     def handle_events(self) -> None:
-        self.input.update()
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.quit()
-            self.input.handle_event(event)
+            if event.type == pygame.WINDOWEXPOSED and self.scene:
+                self.scene.redraw()
+        self.input.update(events)
+        self._handle_profiler_keys()
+
+    def _handle_profiler_keys(self) -> None:
+        if self.input.is_action_pressed("profiler"):
+            self.profiler.toggle()
+            if self.scene:
+                self.scene.redraw()
+
+        if self.input.is_action_pressed("profiler_trace") and self.profiler.enabled:
+            if self.profiler.tracing:
+                self.profiler.stop_trace()
+            else:
+                self.profiler.start_trace(settings.PROFILER_TRACE_FILE)
 
     def update(self, delta: float) -> None:
+        self.loader.update()
+        self._run_preload()
+
         if self.scene:
-            self.scene.update(delta)
+            self.input.dispatch(self.scene.actions)
+            self.profiler.call(self.scene.update, delta)
 
     def render(self) -> None:
+        if settings.DIRTY_RECTS and self.scene and self.scene.background is not None and not self.profiler.enabled:
+            pygame.display.update(self.scene.render_dirty(self.screen))
+            return
+
         self.screen.fill(settings.BACK_COLOR)
         
         if self.scene:
-            self.scene.render(self.screen)
+            self.profiler.call(self.scene.render, self.screen)
 
+        self.profiler.end_frame()
+        self.profiler.render(self.screen)
         pygame.display.update()
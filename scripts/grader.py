@@ -0,0 +1,158 @@
+import os
+import sys
+import json
+import argparse
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from scripts.quizcore import Quiz, load_quiz_file
+from scripts.utils import asset_path
+
+class AnswerSheet:
+    """
+    Правильные ответы теста в виде, удобном для проверки большого числа бланков.
+    Бланк - это список ответов по порядку вопросов: для вопроса с вариантами это список
+    выбранных вариантов (текстом), для вопроса с вводом - строка.
+    """
+    def __init__(self, quiz: Quiz) -> None:
+        self._questions = quiz.questions
+        self._right = [frozenset(question.answers[0]) for question in quiz.questions]
+
+    @property
+    def questions_count(self) -> int:
+        return len(self._questions)
+
+    def grade(self, answers: list) -> list[bool]:
+        results = []
+        for index, question in enumerate(self._questions):
+            answer = answers[index] if index < len(answers) else None
+            if question.inputtable:
+                results.append(isinstance(answer, str) and question.is_right_input(answer))
+            else:
+                results.append(isinstance(answer, list) and all(isinstance(item, str) for item in answer)
+                               and frozenset(answer) == self._right[index])
+        return results
+
+    def grade_lines(self, lines: list[str]) -> tuple[list[str], list[int], int]:
+        """
+        Проверит пачку строк jsonl. Вернёт строки с результатами, число верных ответов
+        на каждый вопрос и число строк, которые не удалось разобрать.
+        """
+        output = []
+        correct = [0] * len(self._questions)
+        errors = 0
+
+        for line in lines:
+            try:
+                submission = json.loads(line)
+                student = submission["student"]
+                answers = submission["answers"]
+                if not isinstance(answers, list):
+                    raise ValueError("answers must be a list")
+            except (ValueError, KeyError, TypeError):
+                errors += 1
+                continue
+
+            results = self.grade(answers)
+            for index, result in enumerate(results):
+                correct[index] += result
+            output.append(json.dumps({"student": student, "score": sum(results), "total": len(results)}, ensure_ascii=False))
+
+        return output, correct, errors
+
+_sheet: AnswerSheet = None
+
+def _init_worker(quiz: Quiz) -> None:
+    global _sheet
+    _sheet = AnswerSheet(quiz)
+
+def _grade_chunk(lines: list[str]) -> tuple[list[str], list[int], int]:
+    return _sheet.grade_lines(lines)
+
+def _read_chunks(file, chunk_size: int):
+    while True:
+        chunk = list(islice(file, chunk_size))
+        if not chunk:
+            return
+        yield [line for line in chunk if line.strip()]
+
+def grade_file(quiz: Quiz, input_file, output_file, workers: int = 1, chunk_size: int = 10000) -> dict:
+    """
+    Потоково проверит бланки из input_file и запишет результаты в output_file.
+    В памяти одновременно находится не больше workers * 2 пачек по chunk_size строк.
+    """
+    sheet = AnswerSheet(quiz)
+    correct = [0] * sheet.questions_count
+    submissions = 0
+    errors = 0
+    total_score = 0
+
+    def _collect(result: tuple) -> None:
+        nonlocal submissions, errors, total_score
+        lines, chunk_correct, chunk_errors = result
+        for index, count in enumerate(chunk_correct):
+            correct[index] += count
+        submissions += len(lines)
+        errors += chunk_errors
+        total_score += sum(chunk_correct)
+        if lines:
+            output_file.write("\n".join(lines) + "\n")
+
+    chunks = _read_chunks(input_file, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            _collect(sheet.grade_lines(chunk))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(quiz,)) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_grade_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    _collect(pending.popleft().result())
+            while pending:
+                _collect(pending.popleft().result())
+
+    return {
+        "quiz": quiz.title,
+        "submissions": submissions,
+        "errors": errors,
+        "mean_score": total_score / submissions if submissions else 0.0,
+        "questions": [
+            {"title": question.title, "correct": count, "rate": count / submissions if submissions else 0.0}
+            for question, count in zip(quiz.questions, correct)
+        ],
+    }
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Grade answer sheets offline")
+    parser.add_argument("quiz", help="quiz .json file, or its file name inside data")
+    parser.add_argument("submissions", help="jsonl file with {\"student\": ..., \"answers\": [...]} per line, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="jsonl file for per-student scores, - for stdout")
+    parser.add_argument("-s", "--stats", help="json file for per-question statistics")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    path = args.quiz if os.path.exists(args.quiz) else asset_path(f"data\\{args.quiz}")
+    result = load_quiz_file(path)
+    if result.quiz is None:
+        parser.error(f"{path}: {'; '.join(result.errors)}")
+
+    input_file = sys.stdin if args.submissions == "-" else open(args.submissions, "r", encoding="utf-8")
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = grade_file(result.quiz, input_file, output_file, args.workers, args.chunk_size)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as file:
+            json.dump(stats, file, ensure_ascii=False, indent=4)
+    else:
+        print(json.dumps(stats, ensure_ascii=False, indent=4), file=sys.stderr)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,118 @@
+import pygame
+
+class Interactive:
+    """
+    Примесь для спрайтов, которые ищутся через HitGrid. Присваивание rect само
+    обновляет клетки спрайта в сетке, вход и выход курсора приходят в on_hover.
+    """
+    _hit_grid = None
+    _rect: pygame.Rect = None
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return self._rect
+
+    @rect.setter
+    def rect(self, value: pygame.Rect) -> None:
+        self._rect = value
+        if self._hit_grid is not None:
+            self._hit_grid.move(self)
+
+    def on_hover(self, hover: bool) -> None:
+        pass
+
+class HitGrid:
+    """
+    Равномерная сетка для поиска спрайтов под точкой. Спрайт лежит во всех клетках,
+    которые задевает его rect, поэтому поиск проверяет только спрайты одной клетки.
+    """
+    def __init__(self, cell_size: int = 128) -> None:
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, int], list] = {}
+        self._sprites: dict[Interactive, tuple[int, list]] = {}
+        self._hovered: set[Interactive] = set()
+        self._order = 0
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def add(self, sprite: Interactive) -> None:
+        if sprite in self._sprites:
+            return
+        self._order += 1
+        self._sprites[sprite] = (self._order, [])
+        sprite._hit_grid = self
+        self.move(sprite)
+
+    def remove(self, sprite: Interactive) -> None:
+        if sprite not in self._sprites:
+            return
+        self._unlink(sprite)
+        del self._sprites[sprite]
+        self._hovered.discard(sprite)
+        sprite._hit_grid = None
+
+    def move(self, sprite: Interactive) -> None:
+        self._unlink(sprite)
+        rect = sprite.rect
+        if rect is None:
+            return
+
+        size = self._cell_size
+        cells = self._sprites[sprite][1]
+        for x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self._cells.setdefault((x, y), []).append(sprite)
+                cells.append((x, y))
+
+    def at(self, point: tuple[int, int]) -> list[Interactive]:
+        """
+        Вернёт спрайты под точкой, начиная с нарисованного последним (верхнего).
+        """
+        cell = self._cells.get((int(point[0]) // self._cell_size, int(point[1]) // self._cell_size))
+        if not cell:
+            return []
+        sprites = [sprite for sprite in cell if sprite.rect.collidepoint(point)]
+        sprites.sort(key=lambda sprite: self._sprites[sprite][0], reverse=True)
+        return sprites
+
+    def update_hover(self, point: tuple[int, int]) -> None:
+        """
+        Сравнит спрайты под точкой с прошлым вызовом и сообщит изменившимся через on_hover.
+        """
+        hovered = set(self.at(point))
+        if hovered == self._hovered:
+            return
+        left, entered = self._hovered - hovered, hovered - self._hovered
+        self._hovered = hovered
+        for sprite in left:
+            sprite.on_hover(False)
+        for sprite in entered:
+            sprite.on_hover(True)
+
+    def _unlink(self, sprite: Interactive) -> None:
+        cells = self._sprites[sprite][1]
+        for key in cells:
+            cell = self._cells[key]
+            cell.remove(sprite)
+            if not cell:
+                del self._cells[key]
+        cells.clear()
+
+class HitGroup(pygame.sprite.Group):
+    """
+    Группа спрайтов, которая держит в grid все свои Interactive спрайты.
+    """
+    def __init__(self, *sprites) -> None:
+        self.grid = HitGrid()
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite: pygame.sprite.Sprite, layer=None) -> None:
+        super().add_internal(sprite, layer)
+        if isinstance(sprite, Interactive):
+            self.grid.add(sprite)
+
+    def remove_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        super().remove_internal(sprite)
+        if isinstance(sprite, Interactive):
+            self.grid.remove(sprite)
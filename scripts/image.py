@@ -1,22 +1,103 @@
 import pygame
 
+def convert_surface(surface: pygame.Surface) -> pygame.Surface:
+    """
+    Переведёт изображение в формат экрана, чтобы blit не конвертировал пиксели каждый кадр.
+    Цветовой ключ непрозрачных изображений ставится с RLEACCEL. У изображений с альфа-каналом
+    пиксели цвета ключа становятся прозрачными, а сам ключ снимается: вместе с альфой он отключает быстрый blit.
+    До создания окна вернёт surface без изменений.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+
+    colorkey = surface.get_colorkey()
+    if surface.get_flags() & pygame.SRCALPHA:
+        surface = surface.convert_alpha()
+        if colorkey is not None:
+            surface.set_colorkey(None)
+            keyed = pygame.mask.from_threshold(surface, (*colorkey[:3], 128), (1, 1, 1, 255))
+            opaque = keyed.to_surface(setcolor=(0, 0, 0, 0), unsetcolor=(255, 255, 255, 255))
+            surface.blit(opaque, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    else:
+        surface = surface.convert()
+        if colorkey is not None:
+            surface.set_colorkey(colorkey, pygame.RLEACCEL)
+    return surface
+
 class Image:
+    """
+    Хранилище изображений. Все изображения переводятся в формат экрана,
+    поэтому их нельзя изменять: для рисования поверх нужно делать copy().
+    """
     def __init__(self) -> None:
         self._images: dict[str, pygame.Surface] = {}
+        self._unconverted: set[str] = set()
     
     def load(self, name: str, path: str) -> None:
         if name in self._images:
             return
         
-        self._images[name] = pygame.image.load(path)
-        self._images[name].set_colorkey((0, 0, 0))
+        image = pygame.image.load(path)
+        image.set_colorkey((0, 0, 0))
+        self.add(name, image)
 
     def add(self, name: str, surface: pygame.Surface | list) -> None:
         if name in self._images:
             return
         
-        self._images[name] = surface
+        self._images[name] = self._convert(name, surface)
 
     def get(self, name: str) -> pygame.Surface:
+        if self._unconverted and pygame.display.get_surface() is not None:
+            for unconverted in self._unconverted.copy():
+                self._images[unconverted] = self._convert(unconverted, self._images[unconverted])
+
         if name in self._images:
             return self._images[name]
+
+    def _convert(self, name: str, surface: pygame.Surface | list) -> pygame.Surface | list:
+        if pygame.display.get_surface() is None:
+            self._unconverted.add(name)
+            return surface
+
+        self._unconverted.discard(name)
+        if isinstance(surface, list):
+            return [convert_surface(variant) for variant in surface]
+        return convert_surface(surface)
+
+class TransformCache:
+    def __init__(self, image: pygame.Surface, angle_step: float = 1.0, scale_step: float = 1.0) -> None:
+        self._image = image
+        self._angle_step = angle_step
+        self._scale_step = scale_step
+        self._rotated: dict[float, pygame.Surface] = {}
+        self._scaled: dict[tuple[int, int], pygame.Surface] = {}
+
+    def rotate(self, angle: float) -> pygame.Surface:
+        """
+        Вернёт повёрнутое изображение, округлив угол до шага angle_step.
+        Одинаковые углы возвращают один и тот же объект Surface, изменять его нельзя.
+        """
+        angle = round(angle / self._angle_step) * self._angle_step
+        surface = self._rotated.get(angle)
+        if surface is None:
+            surface = convert_surface(pygame.transform.rotate(self._image, angle))
+            self._rotated[angle] = surface
+        return surface
+
+    def scale(self, size: tuple[float, float]) -> pygame.Surface:
+        """
+        Вернёт масштабированное изображение, округлив размер до шага scale_step.
+        Одинаковые размеры возвращают один и тот же объект Surface, изменять его нельзя.
+        """
+        size = (int(round(size[0] / self._scale_step) * self._scale_step),
+                int(round(size[1] / self._scale_step) * self._scale_step))
+        surface = self._scaled.get(size)
+        if surface is None:
+            surface = convert_surface(pygame.transform.scale(self._image, size))
+            self._scaled[size] = surface
+        return surface
+
+    def clear(self) -> None:
+        self._rotated.clear()
+        self._scaled.clear()
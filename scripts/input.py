@@ -1,20 +1,58 @@
+from typing import NamedTuple
 import pygame
+from scripts.settings import INPUT_BINDINGS
+
+MOUSE_KEYS = ("m_none", "m_left", "m_wheel", "m_right", "m_wheel_up", "m_wheel_down", "m_button1", "m_button2")
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                  pygame.MOUSEMOTION, pygame.TEXTINPUT, pygame.WINDOWEXPOSED)
+
+class InputState(NamedTuple):
+    """
+    Состояние ввода за один кадр. Клавиши хранятся кодами pygame, кнопки мыши - отрицательными номерами.
+    """
+    keys_down: frozenset = frozenset()
+    keys_pressed: frozenset = frozenset()
+    mouse_pos: tuple[int, int] = (0, 0)
+    mouse_rel: tuple[int, int] = (0, 0)
+    mouse_moved: bool = False
+    text: str = ""
+
+    @property
+    def mouse_buttons(self) -> tuple[bool, bool, bool]:
+        return (-1 in self.keys_down, -2 in self.keys_down, -3 in self.keys_down)
+
+def get_key_code(name: str) -> int:
+    if name in MOUSE_KEYS:
+        return -MOUSE_KEYS.index(name)
+    return pygame.key.key_code(name)
 
 class Input:
-    def __init__(self) -> None:
-        self._keys_down = set()
-        self._keys_pressed = set()
-        self._mouse_keys = ("m_none", "m_left", "m_wheel", "m_right", "m_wheel_up", "m_wheel_down", "m_button1", "m_button2")
-        self._mouse_moved = False
-        self._unicode = ""
-    
+    """
+    Раз в кадр собирает события в неизменяемый InputState.
+    Клавиши можно спрашивать по имени (коды кэшируются) или по действию из INPUT_BINDINGS.
+    """
+    def __init__(self, bindings: dict[str, tuple] = INPUT_BINDINGS) -> None:
+        self._state = InputState(mouse_pos=pygame.mouse.get_pos())
+        self._codes: dict[str, int] = {}
+        self._actions = {action: frozenset(self._get_code(key) for key in keys) for action, keys in bindings.items()}
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+
+    @property
+    def state(self) -> InputState:
+        return self._state
+
     @property
     def mousemoved(self) -> bool:
-        return self._mouse_moved
+        return self._state.mouse_moved
+
+    @property
+    def mouse_pos(self) -> tuple[int, int]:
+        return self._state.mouse_pos
 
     @property
     def unicode(self) -> str:
-        return self._unicode
+        return self._state.text
 
     def get_axis(self, positive_key: str, negative_key: str) -> int:
         key1 = int(self.is_key_down(positive_key))
@@ -22,41 +60,57 @@ class Input:
         return key1 - key2
 
     def is_key_down(self, key: str) -> bool:
-        return key in self._keys_down
+        return self._get_code(key) in self._state.keys_down
 
     def is_key_pressed(self, key: str) -> bool:
-        return key in self._keys_pressed
+        return self._get_code(key) in self._state.keys_pressed
 
     def is_anything_pressed(self) -> bool:
-        return len(self._keys_pressed) > 0
-
-    def update(self) -> None:
-        self._keys_pressed = set()
-        self._unicode = ""
-
-    def handle_event(self, event: pygame.event.Event) -> None:
-        if event.type == pygame.KEYDOWN:
-            key_name = pygame.key.name(event.key)
-            self._keys_down.add(key_name)
-            self._keys_pressed.add(key_name)
-        
-        if event.type == pygame.KEYUP:
-            key_name = pygame.key.name(event.key)
-            self._keys_down.discard(key_name)
-
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            key_name = self._mouse_keys[event.button]
-            self._keys_down.add(key_name)
-            self._keys_pressed.add(key_name)
-        
-        if event.type == pygame.MOUSEBUTTONUP:
-            key_name = self._mouse_keys[event.button]
-            self._keys_down.discard(key_name)        
-
-        if event.type == pygame.TEXTINPUT:
-            self._unicode = event.text
-
-        if self.is_key_pressed("f11"):
+        return len(self._state.keys_pressed) > 0
+
+    def is_action_pressed(self, action: str) -> bool:
+        return not self._actions[action].isdisjoint(self._state.keys_pressed)
+
+    def dispatch(self, handlers: dict[str, callable]) -> None:
+        """
+        Вызовет обработчики действий, нажатых в этом кадре. handlers: {действие: функция без аргументов}.
+        """
+        for action, handler in handlers.items():
+            if self.is_action_pressed(action):
+                handler()
+
+    def update(self, events: list[pygame.event.Event]) -> None:
+        """
+        Соберёт события кадра в новый InputState. Все движения мыши за кадр сливаются в одно.
+        """
+        keys_down = set(self._state.keys_down)
+        keys_pressed = set()
+        rel_x, rel_y = 0, 0
+        moved = False
+        text = ""
+
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                rel_x += event.rel[0]
+                rel_y += event.rel[1]
+                moved = True
+            elif event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+                code = event.key if event.type == pygame.KEYDOWN else -event.button
+                keys_down.add(code)
+                keys_pressed.add(code)
+            elif event.type == pygame.KEYUP or event.type == pygame.MOUSEBUTTONUP:
+                keys_down.discard(event.key if event.type == pygame.KEYUP else -event.button)
+            elif event.type == pygame.TEXTINPUT:
+                text = event.text
+
+        self._state = InputState(frozenset(keys_down), frozenset(keys_pressed), pygame.mouse.get_pos(), (rel_x, rel_y), moved, text)
+
+        if self.is_action_pressed("fullscreen"):
             pygame.display.toggle_fullscreen()
 
-        self._mouse_moved = event.type == pygame.MOUSEMOTION
+    def _get_code(self, key: str) -> int:
+        code = self._codes.get(key)
+        if code is None:
+            code = get_key_code(key)
+            self._codes[key] = code
+        return code
@@ -0,0 +1,85 @@
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, Future
+import pygame
+from scripts.font import FontParams
+
+def _read_file(path: str) -> bytes | None:
+    if path is None:
+        return None
+    with open(path, "rb") as file:
+        return file.read()
+
+class AssetLoader:
+    """
+    Читает и декодирует файлы ресурсов в пуле потоков.
+    Готовые ресурсы передаются в game.image / game.audio только в главном потоке, в update().
+    """
+    def __init__(self, game, workers: int = 4) -> None:
+        self.game = game
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="assets")
+        self._pending: list[tuple[Future, callable]] = []
+        self._total = 0
+        self._finished = 0
+
+    @property
+    def progress(self) -> float:
+        return self._finished / self._total if self._total else 1.0
+
+    @property
+    def done(self) -> bool:
+        return not self._pending
+
+    def image(self, name: str, path: str) -> None:
+        self._submit(self._finish_image, name, pygame.image.load, path)
+
+    def sound(self, name: str, path: str) -> None:
+        self._submit(self._finish_sound, name, pygame.mixer.Sound, path)
+
+    def font(self, fontparams: FontParams) -> None:
+        """
+        В потоке читается только файл шрифта: сам шрифт создаётся в главном потоке,
+        потому что SDL_ttf не рассчитан на работу из нескольких потоков.
+        """
+        self._submit(self._finish_font, fontparams, _read_file, fontparams.fontpath)
+
+    def generate(self, name: str, function, *args) -> None:
+        """
+        Вызовет function(*args) в потоке и добавит результат в game.image под именем name.
+        function не должна обращаться к экрану: перевод в его формат делает game.image.add.
+        """
+        self._submit(self.game.image.add, name, function, *args)
+
+    def update(self, budget: float = 0.004) -> None:
+        """
+        Доделает в главном потоке загруженные ресурсы, укладываясь примерно в budget секунд.
+        Ошибка чтения файла поднимается здесь же.
+        """
+        start = perf_counter()
+        while self._pending and self._pending[0][0].done():
+            future, finish = self._pending.pop(0)
+            self._finished += 1
+            result = future.result()
+            if finish:
+                finish(result)
+            if perf_counter() - start > budget:
+                break
+
+    def finish(self) -> None:
+        while self._pending:
+            self._pending[0][0].result()
+            self.update(float("inf"))
+
+    def _submit(self, finish, name, function, *args) -> None:
+        self._total += 1
+        future = self._executor.submit(function, *args)
+        self._pending.append((future, (lambda result: finish(name, result)) if finish else None))
+
+    def _finish_image(self, name: str, surface: pygame.Surface) -> None:
+        surface.set_colorkey((0, 0, 0))
+        self.game.image.add(name, surface)
+
+    def _finish_font(self, fontparams: FontParams, data: bytes) -> None:
+        fontparams.get_font(data)
+
+    def _finish_sound(self, name: str, sound: pygame.mixer.Sound) -> None:
+        self.game.audio.add(name, sound)
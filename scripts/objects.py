@@ -6,9 +6,15 @@ from pygame.math import Vector2 as vec2
 from pygame.math import Vector3 as vec3
 from scripts.font import Font, FontParams
 from scripts.timer import Timer
+from scripts.hittest import Interactive
 from scripts.utils import set_character
 from scripts.settings import *
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class InputBox:
     def __init__(self,
                  game,
@@ -118,7 +124,7 @@ class ImageSprite(pygame.sprite.Sprite):
         self._change_position()
 
     def mouse_in(self) -> bool:
-        return self.rect.collidepoint(pygame.mouse.get_pos())
+        return self.rect.collidepoint(self.game.input.mouse_pos)
 
     def _change_position(self) -> None:
         self.rect = self.image.get_rect(**{self._anchor: self._position})
@@ -140,6 +146,7 @@ class TextSprite(pygame.sprite.Sprite):
         self._position = position
         self._anchor = anchor
         self._fontparams = fontparams
+        self._text: str = None
         self.draw_text(text)
 
     @property
@@ -164,6 +171,9 @@ class TextSprite(pygame.sprite.Sprite):
         self.rect = self.image.get_rect(**{self._anchor: self._position})
 
     def draw_text(self, text: str) -> None:
+        if text == self._text:
+            return
+        self._text = text
         self.image = self._fontparams.get_render(text)
         self._change_position()
 
@@ -229,7 +239,7 @@ class InputBoxSprite(TextSprite):
         self._check_inputbox_changed()
         self._check_blink()
 
-class ButtonSprite(TextSprite):
+class ButtonSprite(Interactive, TextSprite):
     def __init__(self, 
                  game, 
                  text: str = "Button", 
@@ -253,20 +263,13 @@ class ButtonSprite(TextSprite):
             pygame.draw.rect(self.image, (200, 200, 200), pygame.Rect(self.rect.topleft, self.rect.bottomright))
         self.rect = self.image.get_rect(**{self._anchor: self._position})
     
-    def _check_hover(self) -> None:
-        prev_hover = self._hover
-
-        self._hover = self.rect.collidepoint(pygame.mouse.get_pos())
-
-        if self._hover != prev_hover:
-            self._refresh_image()
+    def on_hover(self, hover: bool) -> None:
+        self._hover = hover
+        self._change_image()
 
     def post_draw(self, surface: pygame.Surface) -> None:
         surface.blit(self._text_image, self._text_image.get_rect(**{self._anchor: self._position}))
 
-    def update(self, delta: float) -> None:
-        self._check_hover()
-
 class Particle(pygame.sprite.Sprite):
     def __init__(self,
                  position: vec2 = vec2(0, 0),
@@ -303,6 +306,7 @@ class Particle(pygame.sprite.Sprite):
 class Star:
     def __init__(self, game) -> None:
         self._screen = game.screen
+        self._input = game.input
         self._pos3d = self.get_pos3d()
         self._velocity = random.uniform(0.15, 0.45)
         self._color = random.choice([BLU_1, BLU_2, BLU_3, BLU_4])
@@ -327,7 +331,7 @@ class Star:
 
         self._pos3d.xy = self._pos3d.xy.rotate(0.2)
         if self._cursor:
-            self._screen_position += (self._screen.get_rect().center - vec2(pygame.mouse.get_pos())) / 5
+            self._screen_position += (self._screen.get_rect().center - vec2(self._input.mouse_pos)) / 5
 
     def render(self) -> None:
         pygame.draw.rect(self._screen, self._color, (*self._screen_position, self._size, self._size))
@@ -347,7 +351,80 @@ class Starfield:
         for star in self._stars: star._cursor = value
 ###
 
-class QuizTextBubble(TextSprite):
+class VectorStarfield:
+    """
+    Тот же Starfield, но все звёзды хранятся в массивах NumPy,
+    а обновление, сортировка по глубине и отсечение выполняются разом для всех звёзд.
+    """
+    def __init__(self, game, stars: int = 500) -> None:
+        self._screen = game.screen
+        self._input = game.input
+        self._colors = (BLU_1, BLU_2, BLU_3, BLU_4)
+        self._pos3d = numpy.zeros((stars, 3))
+        self._velocity = numpy.random.uniform(0.15, 0.45, stars)
+        self._color = numpy.random.randint(0, len(self._colors), stars)
+        self._size = numpy.zeros(stars)
+        self._screen_position = numpy.zeros((stars, 2))
+        self._order = numpy.arange(stars)
+        self._squares: dict[tuple[int, int], pygame.Surface] = {}
+        self._cursor = True
+
+        angle = math.radians(0.2)
+        self._rotation = numpy.array([[math.cos(angle), math.sin(angle)], [-math.sin(angle), math.cos(angle)]])
+        self._respawn(numpy.ones(stars, dtype=bool))
+
+    def _respawn(self, mask, scale_pos=35) -> None:
+        count = int(mask.sum())
+        h = self._screen.get_rect().h
+        angle = numpy.random.uniform(0, 2 * math.pi, count)
+        radius = numpy.random.randint(h // 4, h // 3, count) * scale_pos
+        self._pos3d[mask, 0] = radius * numpy.sin(angle)
+        self._pos3d[mask, 1] = radius * numpy.cos(angle)
+        self._pos3d[mask, 2] = 40
+
+    def _get_square(self, color: int, size: int) -> pygame.Surface:
+        key = (color, size)
+        square = self._squares.get(key)
+        if square is None:
+            square = pygame.Surface((size, size))
+            square.fill(self._colors[color])
+            self._squares[key] = square
+        return square
+
+    def update(self) -> None:
+        self._pos3d[:, 2] -= self._velocity
+        respawn = self._pos3d[:, 2] < 1
+        if respawn.any():
+            self._respawn(respawn)
+
+        z = self._pos3d[:, 2]
+        center = self._screen.get_rect().center
+        self._screen_position = self._pos3d[:, :2] / z[:, None] + center
+        self._size = (40 - z) / (0.2 * z)
+
+        self._pos3d[:, :2] = self._pos3d[:, :2] @ self._rotation
+        if self._cursor:
+            self._screen_position += (numpy.array(center) - self._input.mouse_pos) / 5
+
+        self._order = numpy.argsort(-z, kind="stable")
+
+    def render(self) -> None:
+        w, h = self._screen.get_size()
+        order = self._order
+        sizes = self._size[order].astype(int)
+        positions = self._screen_position[order].astype(int)
+        visible = (sizes > 0) & (positions[:, 0] < w) & (positions[:, 1] < h)\
+                & (positions[:, 0] + sizes > 0) & (positions[:, 1] + sizes > 0)
+
+        colors = self._color[order][visible].tolist()
+        sizes = sizes[visible].tolist()
+        positions = positions[visible].tolist()
+        self._screen.fblits([(self._get_square(c, s), p) for c, s, p in zip(colors, sizes, positions)])
+
+    def set_cursor_mode(self, value: bool) -> None:
+        self._cursor = value
+
+class QuizTextBubble(Interactive, TextSprite):
     def __init__(self,
                  game,
                  answer_index: int,
@@ -394,21 +471,16 @@ class QuizTextBubble(TextSprite):
         if not self._hover and self._timer0.expired:
             self._change_bubble_image()
 
-    def _check_hover(self) -> None:
-        prev_hover = self._hover
-
-        self._hover = self.rect.collidepoint(pygame.mouse.get_pos())
-
-        if self._hover != prev_hover:
-            if self._hover: 
-                self.game.audio.play("answer_select")
-            self._change_bubble_image()
+    def on_hover(self, hover: bool) -> None:
+        self._hover = hover
+        if self._hover: 
+            self.game.audio.play("answer_select")
+        self._change_bubble_image()
 
     def post_draw(self, surface: pygame.Surface) -> None:
         surface.blit(self._text_image, self._text_image.get_rect(**{self._anchor: self._position}))
 
     def update(self, delta: float) -> None:
-        self._check_hover()
         self._check_time_to_deform()
 
 class QuizInputBubble(TextSprite):
@@ -422,6 +494,7 @@ class QuizInputBubble(TextSprite):
         self._inputbox = InputBox(game, label)
         self._inputbox.enabled = True
         self._cursor_rect = pygame.Rect((-1, -1), (1, self._text_image.get_rect().h))
+        self._cursor_offset = 0
         self._change_image()
         
         self._timer0 = Timer(0.5, True)
@@ -441,14 +514,14 @@ class QuizInputBubble(TextSprite):
 
     def _draw_cursor(self, surface: pygame.Surface) -> None:
         rect = self._text_image.get_rect(**{self._anchor: self._position})
-        x = rect.right - self._fontparams.get_font_size(self._inputbox.text[self._inputbox.cursor + 1:])[0]
-        self._cursor_rect.midleft = (x, rect.centery)
+        self._cursor_rect.midleft = (rect.right - self._cursor_offset, rect.centery)
         pygame.draw.rect(surface, BLACK, self._cursor_rect)
 
     def _handle_inputbox(self) -> None:
         self._inputbox.update()
         if self._inputbox.changed:
             self.draw_text(self._inputbox.text if self._inputbox.text != "" else self._inputbox.label)
+            self._cursor_offset = self._fontparams.get_font_size(self._inputbox.text[self._inputbox.cursor + 1:])[0]
             self._timer1.reset()                   ###############
             self._cursor_blinking = False          ###############
 
@@ -485,7 +558,7 @@ class QuizButtonBubble(QuizTextBubble):
             self.image = random.choice(self.game.image.get("quiz_next_question_idle"))
         self.rect = self.image.get_rect(**{self._anchor: self._position})
 
-class QuizMenuBubble(ImageSprite):
+class QuizMenuBubble(Interactive, ImageSprite):
     def __init__(self, 
                  game,
                  quiz,
@@ -494,18 +567,25 @@ class QuizMenuBubble(ImageSprite):
                  anchor: str = "center") -> None:
 
         super().__init__(game, pygame.Surface((400, 300)), position, anchor)
+        self._back_image = pygame.transform.scale_by(self.game.image.get("hourglass").copy(), 2)
+        self._back_image.set_alpha(50)
+        self.set_quiz(quiz, index)
+
+    def set_quiz(self, quiz, index: int) -> None:
+        """
+        Перерисует карточку для другого теста на той же поверхности, чтобы меню могло переиспользовать карточки.
+        """
         self.index = index
+        self._hover = False
         self._create_quiz_info(quiz)
 
     def _create_quiz_info(self, quiz) -> None:
+        image_rect = self.image.get_rect()
         self.image.fill(ALT_BLU_3)
         self.image.set_alpha(240)
 
-        back_image = pygame.transform.scale_by(self.game.image.get("hourglass").copy(), 2)
-        back_image.set_alpha(50)
-
-        self.image.blit(back_image, back_image.get_rect(bottomright = self.rect.bottomright))
-        pygame.draw.rect(self.image, WHITE, self.rect, 2)
+        self.image.blit(self._back_image, self._back_image.get_rect(bottomright = image_rect.bottomright))
+        pygame.draw.rect(self.image, WHITE, image_rect, 2)
 
         font = self.game.font.get("menu_elem")
         
@@ -521,6 +601,9 @@ class QuizMenuBubble(ImageSprite):
         self.image.blit(time_image, (10, title_rect.h + 55))
         pygame.draw.line(self.image, WHITE, (10, title_rect.h + 15), (390, title_rect.h + 15))
     
+    def on_hover(self, hover: bool) -> None:
+        self._hover = hover
+
     def post_draw(self, surface: pygame.Surface) -> None:
-        if self.mouse_in():
+        if self._hover:
             surface.blit(self._label, self._label.get_rect(center=self.rect.midbottom - vec2(0, 30)))
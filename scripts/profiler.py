@@ -0,0 +1,119 @@
+import json
+from collections import deque
+from time import perf_counter, time
+import pygame
+
+class Profiler:
+    def __init__(self, window: int = 60, refresh: int = 15) -> None:
+        self._enabled = False
+        self._window = window
+        self._refresh = refresh
+        self._frame_index = 0
+        self._frame: dict[str, float] = {}
+        self._samples: dict[str, deque] = {}
+        self._trace = None
+        self._font: pygame.font.Font = None
+        self._overlay: pygame.Surface = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def tracing(self) -> bool:
+        return self._trace is not None
+
+    def toggle(self) -> None:
+        self._enabled = not self._enabled
+        self._frame.clear()
+        self._samples.clear()
+        self._overlay = None
+        if not self._enabled:
+            self.stop_trace()
+
+    def start_trace(self, path: str) -> None:
+        if self._trace is None:
+            self._trace = open(path, "a", encoding="utf-8")
+
+    def stop_trace(self) -> None:
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self._frame[name] = self._frame.get(name, 0.0) + seconds
+
+    def call(self, function, *args):
+        """
+        Вызовет function и, если профилирование включено, запишет время под её __qualname__.
+        """
+        if not self._enabled:
+            return function(*args)
+        t0 = perf_counter()
+        result = function(*args)
+        self.add(function.__qualname__, perf_counter() - t0)
+        return result
+
+    def update_sprites(self, group: pygame.sprite.Group, delta: float) -> None:
+        for sprite in group.sprites():
+            t0 = perf_counter()
+            sprite.update(delta)
+            self.add(f"{type(sprite).__name__}.update", perf_counter() - t0)
+
+    def draw_sprites(self, group: pygame.sprite.Group, surface: pygame.Surface) -> None:
+        sprites = group.sprites()
+        for sprite in sprites:
+            t0 = perf_counter()
+            surface.blit(sprite.image, sprite.rect)
+            self.add(f"{type(sprite).__name__}.draw", perf_counter() - t0)
+        for sprite in sprites:
+            if hasattr(sprite, "post_draw"):
+                t0 = perf_counter()
+                sprite.post_draw(surface)
+                self.add(f"{type(sprite).__name__}.post_draw", perf_counter() - t0)
+
+    def end_frame(self) -> None:
+        if not self._enabled:
+            return
+
+        for name, seconds in self._frame.items():
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self._window)
+            self._samples[name].append(seconds)
+
+        if self._trace is not None:
+            sections = {name: round(seconds * 1000, 4) for name, seconds in self._frame.items()}
+            self._trace.write(json.dumps({"frame": self._frame_index, "time": time(), "sections": sections}) + "\n")
+
+        self._frame_index += 1
+        self._frame = {}
+
+    def averages(self) -> dict[str, float]:
+        """
+        Вернёт среднее время в миллисекундах за последние window кадров для каждого замера.
+        """
+        return {name: sum(samples) / len(samples) * 1000 for name, samples in self._samples.items()}
+
+    def render(self, surface: pygame.Surface) -> None:
+        if not self._enabled:
+            return
+
+        if self._overlay is None or self._frame_index % self._refresh == 0:
+            self._overlay = self._create_overlay()
+        surface.blit(self._overlay, (5, 5))
+
+    def _create_overlay(self) -> pygame.Surface:
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+
+        averages = sorted(self.averages().items(), key=lambda item: item[1], reverse=True)
+        lines = [f"{'trace ' if self.tracing else ''}frame {self._frame_index}"]
+        lines += [f"{ms:7.3f} ms  {name}" for name, ms in averages]
+
+        line_height = self._font.get_linesize()
+        width = max(self._font.size(line)[0] for line in lines) + 10
+        overlay = pygame.Surface((width, line_height * len(lines) + 10))
+        overlay.set_alpha(200)
+        for index, line in enumerate(lines):
+            overlay.blit(self._font.render(line, True, (255, 255, 255)), (5, 5 + line_height * index))
+        return overlay
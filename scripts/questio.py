@@ -1,243 +1,113 @@
+import os
+import zlib
 import random
-from time import time, strftime, gmtime
+import pygame
 from pygame import Surface, draw, transform
 from pygame.math import Vector2 as vec2
+from scripts.quizcore import *
 from scripts.utils import *
 from scripts.settings import *
 
-class Question:
-    def __init__(self, 
-                 title: str = "NewQuestion", 
-                 answers: list = [["right"], ["wrong"]], 
-                 duration: int = 20,
-                 explain: str = "right is right",
-                 inputtable: bool = False) -> None:
-        self._title = title
-        self._answers = answers
-        self._duration = duration
-        self._explain = explain
-        self._inputtable = inputtable
-    
-    @property
-    def title(self) -> str:
-        return self._title
-
-    @property
-    def duration(self) -> int:
-        return self._duration
-    
-    @property
-    def answers(self) -> list:
-        return self._answers
-    
-    @property
-    def inputtable(self) -> bool:
-        return self._inputtable
-
-class Quiz:
-    def __init__(self, 
-                 title: str = "NewTest",
-                 questions: list = []) -> None:
-        self._title = title
-        self._questions = questions
-        self._question_index = 0
-        self._correct_answers_count = 0
-        self._question_start_time = 0
-        self._merge_result = []
-        self._ended = False
-        self._explained = False
-        self._answers_received = []
-
-        self._shuffle_answers()
-    
-    @property
-    def title(self) -> str:
-        return self._title
-    
-    @property
-    def questions(self) -> list:
-        return self._questions
-    
-    @property
-    def questions_count(self) -> int:
-        return len(self._questions)
-
-    @property
-    def question_index(self) -> int:
-        return self._question_index
-
-    @property
-    def question(self) -> dict:
-        if self._question_index >= len(self._questions):
-            return self._questions[-1]
-        return self._questions[self._question_index]
-
-    @property
-    def answers(self) -> list:
-        return self._merge_result
-
-    @property
-    def answers_count(self) -> int:
-        return len(self._merge_result)
-
-    @property
-    def correct_answers_count(self) -> int:
-        return self._correct_answers_count
-
-    @property
-    def time_left(self) -> float:
-        return self.question.duration - (time() - self._question_start_time)
-
-    @time_left.setter
-    def time_left(self, value: float) -> None:
-        self._question_start_time = time()
-
-    @property
-    def ended(self) -> bool:
-        return self._ended
-
-    @property
-    def explained(self) -> bool:
-        return self._explained
-
-    def get_qs_total_time(self, in_str=False) -> int | str:
-        total_time = 0
-        for i in self._questions:
-            total_time += i.duration
-        
-        return strftime("%H`%M`%S", gmtime(total_time)) if in_str else total_time
-
-    def _shuffle_answers(self) -> None:
-        answers = self.question.answers
-        self._merge_result = answers[0] + answers[1]
-        random.shuffle(self._merge_result)
-
-    def _check_answer(self) -> None:
-        if time() - self._question_start_time > self.question.duration + 1:
-            return
-
-        correct = 0
-        wrong = 0
-        for answer in self._answers_received:
-            if type(answer) == int:
-                if self._merge_result[answer] in self.question.answers[0]:
-                    correct += 1
-                else:
-                    wrong += 1
-            if type(answer) == str:
-                if answer.lower().replace(" ", "") in [i.lower().replace(" ", "") for i in self.question.answers[0]]:
-                    self._correct_answers_count += 1
-                else:
-                    wrong = 1
-        
-        if correct == len(self.question.answers[0]) and wrong == 0:
-            self._correct_answers_count += 1
-
-    def get_answer(self, answer: int | str) -> None:
-        answer_type = type(answer)
-        answer_inputtable = self.question.inputtable
-
-        if (answer_type is int) and (not answer_inputtable)\
-        or (answer_type is str) and (answer_inputtable):
-            if answer in self._answers_received:
-                self._answers_received.remove(answer)
-            else:
-                self._answers_received.append(answer)
-
-    def next_question(self) -> None:
-        if self._ended: return
-
-        if self._question_index == len(self._questions) - 1:
-            self._ended = True
-
-        self._check_answer()
-        self._question_index += 1
-        self._answers_received.clear()
-        self._question_start_time = time()
-        self._shuffle_answers()
-
-def create_quizzes():
-    quizzes = []
-    for file in get_files_from(asset_path("data")):
-        quiz_questions = []
-
-        file_source = read_json(asset_path(f"data\\{file}"))
-        if file_source == {}:
-            continue
-
-        title = file_source.get("title")
-        questions = file_source.get("questions")
-        if questions == None or not isinstance(questions, list)\
-        or title == None or not isinstance(title, str):
-            continue
-
-        for question in questions:
-            text = question.get("title")
-            answers = question.get("answers")
-            right = answers.get("right")
-            wrong = answers.get("wrong")
-            duration = question.get("duration")
-            explain = question.get("explain")
-            inputtable = question.get("inputtable")
-
-            if not isinstance(text, str) or not isinstance(answers, dict)\
-            or not isinstance(right, list) or not isinstance(wrong, list)\
-            or not isinstance(duration, int) or not isinstance(explain, str)\
-            or not isinstance(inputtable, bool):
-                continue
-
-            if len(right + wrong) > 4 or len(right + wrong) <= 0:
-                continue
-
-            quiz_questions.append(Question(text, [right, wrong], duration, explain, inputtable))
-        quizzes.append(Quiz(title, quiz_questions))
-    return quizzes
+def create_bubble(size, color1, color2, check_image: Surface = None, wasd_image: Surface = None) -> Surface:
+    size = vec2(size)
+    p0 = vec2(0, 0) #(10 + random.randrange(-5, 5), 10 + random.randrange(-5, 5))
+    p1 = vec2(size.x, 0) #(size[0] - 10 + random.randrange(-5, 5), 10 + random.randrange(-5, 5))
+    p2 = vec2(size.x, size.y)#(size[0] - 10 + random.randrange(-5, 5), size[1] - 10 + random.randrange(-5, 5))
+    p3 = vec2(0, size.y)#(10 + random.randrange(-5, 5), size[1] - 10 + random.randrange(-5, 5))
+
+    image = Surface(size)
+    image.set_colorkey((0, 0, 0))
+    #draw.polygon(image, color1, [(p0[0] - 10, p0[1] - 10), p1, (p2[0] + 10, p2[1] + 10), p3])
+    #draw.polygon(image, color2, [p0, p1, p2, p3])
+
+    r0 = random.randrange(-5, 0)
+    r1 = random.randrange(-5, 0)
+    r2 = random.randrange(-5, 0)
+    r3 = random.randrange(-5, 0)
+
+    draw.polygon(image, WHITE, [p0 + vec2(-r0, -r1), p1 + vec2(-12 + r2, 12 - r3), p2 + vec2(r0, r1), p3 + vec2(12 - r0, -12 + r2)])
+    draw.polygon(image, color1, [p0 + vec2(4 - r0, 4 - r1), p1 + vec2(-16 + r2, 16 - r3), p2 + vec2(-4 + r0, -4 + r1), p3 + vec2(16 - r0, -16 + r2)])
+    draw.polygon(image, color2, [p0 + vec2(16 - r0, 16 - r1), p1 + vec2(-16 + r2, 16 - r3), p2 + vec2(-16 + r0, -16 + r1), p3 + vec2(16 - r0, -16 + r2)])
+
+    if check_image:
+        check_rect = check_image.get_rect()
+        startpos = image.get_rect().topright
+        image.blit(check_image, (startpos[0] - check_rect.w, startpos[1]))
+
+    if wasd_image:
+        for _ in range(1):
+            scaled_image = transform.scale_by(wasd_image, random.uniform(0.5, 2.5))
+            bubble_rect = image.get_rect()
+            x = random.uniform(10, bubble_rect.w - 10)
+            y = random.uniform(10, bubble_rect.h - 10)
+            wasd_rect = scaled_image.get_rect(center = (x, y))
+            image.blit(scaled_image, wasd_rect)
+
+    return image
+
+def get_bubble_cache_path(size, color1, color2, count: int, check: bool = False, wasd: bool = False) -> str:
+    colors = "".join(f"{channel:02x}" for channel in (*color1, *color2))
+    flags = ("c" if check else "") + ("w" if wasd else "")
+    return os.path.join(BUBBLE_CACHE_DIR, f"v{BUBBLE_CACHE_VERSION}_{size[0]}x{size[1]}_{colors}_{count}{flags}.bin")
+
+def create_bubble_pool(size, color1, color2, count: int, check: bool = False, wasd: bool = False) -> list[Surface]:
+    """
+    Вернёт count вариантов пузыря. Варианты хранятся на диске одной картинкой, склеенной по вертикали,
+    в виде сжатых zlib пикселей RGB: zlib отпускает GIL, а png декодируется заметно дольше.
+    В имени файла записаны размер, цвета, число вариантов и версия генератора.
+    Не трогает экран, поэтому может работать в потоке загрузчика.
+    """
+    path = get_bubble_cache_path(size, color1, color2, count, check, wasd)
+    width, height = size
+
+    try:
+        with open(path, "rb") as file:
+            pixels = zlib.decompress(file.read())
+        if len(pixels) != width * height * count * 3:
+            raise ValueError(f"{path} has wrong size")
+        strip = pygame.image.frombytes(pixels, (width, height * count), "RGB")
+    except (OSError, ValueError, zlib.error):
+        strip = None
+
+    if strip is None:
+        check_image = pygame.image.load(asset_path(f"{IMAGES_DIR}check.png")) if check else None
+        wasd_image = pygame.image.load(asset_path(f"{IMAGES_DIR}wasd.png")) if wasd else None
+        if check_image:
+            check_image.set_colorkey((0, 0, 0))
+        if wasd_image:
+            wasd_image.set_colorkey((0, 0, 0))
+
+        strip = Surface((width, height * count))
+        for index in range(count):
+            strip.blit(create_bubble(size, color1, color2, check_image, wasd_image), (0, height * index))
+
+        try:
+            os.makedirs(BUBBLE_CACHE_DIR, exist_ok=True)
+            with open(f"{path}.tmp", "wb") as file:
+                file.write(zlib.compress(pygame.image.tobytes(strip, "RGB"), 1))
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            pass
+
+    variants = []
+    for index in range(count):
+        variant = strip.subsurface((0, height * index, width, height)).copy()
+        variant.set_colorkey((0, 0, 0))
+        variants.append(variant)
+    return variants
+
+def create_bubble_variant(size, color1, color2, check: bool = False, wasd: bool = False) -> Surface:
+    return create_bubble_pool(size, color1, color2, 1, check, wasd)[0]
 
 def draw_quiz_bubbles(game):
-    def _create_bubble(size, color1, color2, check=False, wasd=False):
-        size = vec2(size)
-        p0 = vec2(0, 0) #(10 + random.randrange(-5, 5), 10 + random.randrange(-5, 5))
-        p1 = vec2(size.x, 0) #(size[0] - 10 + random.randrange(-5, 5), 10 + random.randrange(-5, 5))
-        p2 = vec2(size.x, size.y)#(size[0] - 10 + random.randrange(-5, 5), size[1] - 10 + random.randrange(-5, 5))
-        p3 = vec2(0, size.y)#(10 + random.randrange(-5, 5), size[1] - 10 + random.randrange(-5, 5))
-
-        image = Surface(size)
-        image.set_colorkey((0, 0, 0))
-        #draw.polygon(image, color1, [(p0[0] - 10, p0[1] - 10), p1, (p2[0] + 10, p2[1] + 10), p3])
-        #draw.polygon(image, color2, [p0, p1, p2, p3])
-
-        r0 = random.randrange(-5, 0)
-        r1 = random.randrange(-5, 0)
-        r2 = random.randrange(-5, 0)
-        r3 = random.randrange(-5, 0)
-
-        draw.polygon(image, WHITE, [p0 + vec2(-r0, -r1), p1 + vec2(-12 + r2, 12 - r3), p2 + vec2(r0, r1), p3 + vec2(12 - r0, -12 + r2)])
-        draw.polygon(image, color1, [p0 + vec2(4 - r0, 4 - r1), p1 + vec2(-16 + r2, 16 - r3), p2 + vec2(-4 + r0, -4 + r1), p3 + vec2(16 - r0, -16 + r2)])
-        draw.polygon(image, color2, [p0 + vec2(16 - r0, 16 - r1), p1 + vec2(-16 + r2, 16 - r3), p2 + vec2(-16 + r0, -16 + r1), p3 + vec2(16 - r0, -16 + r2)])
-
-        if check:
-            check_image = game.image.get("check")
-            check_rect = check_image.get_rect()
-            startpos = image.get_rect().topright
-            image.blit(check_image, (startpos[0] - check_rect.w, startpos[1]))
-
-        if wasd:
-            for _ in range(1):
-                wasd_image = transform.scale_by(game.image.get("wasd").copy(), random.uniform(0.5, 2.5))
-                bubble_rect = image.get_rect()
-                x = random.uniform(10, bubble_rect.w - 10)
-                y = random.uniform(10, bubble_rect.h - 10)
-                wasd_rect = wasd_image.get_rect(center = (x, y))
-                image.blit(wasd_image, wasd_rect)
-
-        return image
-
-    game.image.load("check", asset_path(f"{IMAGES_DIR}check.png"))
-    game.image.load("wasd", asset_path(f"{IMAGES_DIR}wasd.png"))    
-    game.image.add("quiz_bubble_idle", [_create_bubble((380, 170), BLU_4, BLU_1) for _ in range(3)])
-    game.image.add("quiz_bubble_hover", _create_bubble((390, 180), BLU_3, BLU_0))
-    game.image.add("quiz_bubble_idle_check", [_create_bubble((380, 170), GRE_4, GRE_2, True) for _ in range(3)])
-    game.image.add("quiz_bubble_hover_check", _create_bubble((390, 180), GRE_3, GRE_1, True))
-    game.image.add("quiz_next_question_idle", [_create_bubble((260, 80), BLU_4, BLU_1) for _ in range(3)])
-    game.image.add("quiz_next_question_hover", _create_bubble((270, 90), BLU_3, BLU_0))
-    game.image.add("quiz_bubble_input", [_create_bubble((780, 100), BLU_4, BLU_1) for _ in range(3)])
\ No newline at end of file
+    """
+    Поставит создание пузырей в очередь загрузчика: пулы вариантов читаются из кэша на диске
+    или рисуются заново в потоке, в главном потоке остаётся только перевод в формат экрана.
+    """
+    game.loader.generate("quiz_bubble_idle", create_bubble_pool, (380, 170), BLU_4, BLU_1, BUBBLE_VARIANTS)
+    game.loader.generate("quiz_bubble_hover", create_bubble_variant, (390, 180), BLU_3, BLU_0)
+    game.loader.generate("quiz_bubble_idle_check", create_bubble_pool, (380, 170), GRE_4, GRE_2, BUBBLE_VARIANTS, True)
+    game.loader.generate("quiz_bubble_hover_check", create_bubble_variant, (390, 180), GRE_3, GRE_1, True)
+    game.loader.generate("quiz_next_question_idle", create_bubble_pool, (260, 80), BLU_4, BLU_1, BUBBLE_VARIANTS)
+    game.loader.generate("quiz_next_question_hover", create_bubble_variant, (270, 90), BLU_3, BLU_0)
+    game.loader.generate("quiz_bubble_input", create_bubble_pool, (780, 100), BLU_4, BLU_1, BUBBLE_VARIANTS)
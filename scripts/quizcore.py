@@ -0,0 +1,611 @@
+import os
+import re
+import json
+import random
+from bisect import bisect_left
+import unicodedata
+from functools import partial
+from time import time, strftime, gmtime
+from scripts.utils import asset_path, get_files_from, read_json
+from scripts.settings import QUIZ_INDEX_FILE, QUIZ_INDEX_VERSION, QUIZ_LOAD_MIN_FILES, QUIZ_LOAD_PROCESS_BYTES
+
+def normalize_answer(answer: str) -> str:
+    return unicodedata.normalize("NFKC", answer).casefold().replace(" ", "")
+
+def get_search_terms(text: str) -> list[str]:
+    return re.findall(r"\w+", unicodedata.normalize("NFKC", text).casefold())
+
+def edit_distance(a: str, b: str, limit: int = None) -> int:
+    """
+    Расстояние Левенштейна между строками. Если задан limit, счёт прерывается,
+    как только расстояние гарантированно больше limit (тогда вернётся limit + 1).
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        left = i
+        for j, char_b in enumerate(b):
+            left = min(previous[j + 1] + 1, left + 1, previous[j] + (char_a != char_b))
+            current.append(left)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    if limit is not None:
+        return min(previous[-1], limit + 1)
+    return previous[-1]
+
+class BKTree:
+    """
+    Дерево Буркхарда-Келлера для поиска строк с расстоянием Левенштейна не больше заданного.
+    """
+    def __init__(self, words: list = ()) -> None:
+        self._root = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        if self._root is None:
+            self._root = (word, {})
+            return
+
+        node = self._root
+        while True:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def find(self, word: str, max_distance: int, limits: dict[str, int] = None) -> bool:
+        """
+        Есть ли в дереве слово на расстоянии не больше max_distance. Если задан limits,
+        для слов дерева из него допуск берётся меньший: min(max_distance, limits[слово]).
+        """
+        if self._root is None:
+            return False
+
+        nodes = [self._root]
+        while nodes:
+            node_word, children = nodes.pop()
+            distance = edit_distance(word, node_word, max(children, default=0) + max_distance)
+            if distance <= (max_distance if limits is None else min(max_distance, limits[node_word])):
+                return True
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    nodes.append(child)
+        return False
+
+class Question:
+    def __init__(self, 
+                 title: str = "NewQuestion", 
+                 answers: list = [["right"], ["wrong"]], 
+                 duration: int = 20,
+                 explain: str = "right is right",
+                 inputtable: bool = False,
+                 answer_keys: list = None,
+                 fuzzy: int = 0) -> None:
+        self._title = title
+        self._answers = (tuple(answers[0]), tuple(answers[1]))
+        self._duration = duration
+        self._explain = explain
+        self._inputtable = inputtable
+        if answer_keys is None:
+            answer_keys = [normalize_answer(answer) for answer in self._answers[0]]
+        self._answer_keys = frozenset(answer_keys)
+        self._fuzzy = fuzzy
+        self._fuzzy_index = BKTree(sorted(self._answer_keys)) if fuzzy > 0 and inputtable else None
+        self._fuzzy_limits = {key: min(fuzzy, max(len(key) - 1, 0)) for key in self._answer_keys} if self._fuzzy_index else None
+    
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @property
+    def duration(self) -> int:
+        return self._duration
+    
+    @property
+    def answers(self) -> tuple:
+        return self._answers
+    
+    @property
+    def explain(self) -> str:
+        return self._explain
+
+    @property
+    def inputtable(self) -> bool:
+        return self._inputtable
+
+    @property
+    def answer_keys(self) -> frozenset:
+        return self._answer_keys
+
+    @property
+    def fuzzy(self) -> int:
+        return self._fuzzy
+
+    def is_right_input(self, answer: str) -> bool:
+        """
+        Проверит введённый ответ. Для вопросов с fuzzy > 0 засчитываются ответы
+        с опечатками, если расстояние Левенштейна до правильного ответа не больше fuzzy
+        и меньше длины этого ответа: иначе короткий ответ засчитывался бы за любой ввод.
+        Пустой ввод не засчитывается никогда.
+        """
+        key = normalize_answer(answer)
+        if not key:
+            return False
+        if key in self._answer_keys:
+            return True
+        if self._fuzzy_index is None:
+            return False
+        return self._fuzzy_index.find(key, self._fuzzy, self._fuzzy_limits)
+
+class Quiz:
+    """
+    Неизменяемое описание теста. Один объект можно разделять между любым числом прохождений,
+    состояние прохождения хранится в QuizSession.
+    """
+    def __init__(self, 
+                 title: str = "NewTest",
+                 questions: list = []) -> None:
+        self._title = title
+        self._questions = tuple(questions)
+        self._total_time = sum(question.duration for question in self._questions)
+    
+    @property
+    def title(self) -> str:
+        return self._title
+    
+    @property
+    def questions(self) -> tuple:
+        return self._questions
+    
+    @property
+    def questions_count(self) -> int:
+        return len(self._questions)
+
+    def get_qs_total_time(self, in_str=False) -> int | str:
+        total_time = self._total_time
+        return strftime("%H`%M`%S", gmtime(total_time)) if in_str else total_time
+
+    def start(self) -> "QuizSession":
+        return QuizSession(self)
+
+class QuizSession:
+    def __init__(self, quiz: Quiz) -> None:
+        self._quiz = quiz
+        self._question_index = 0
+        self._correct_answers_count = 0
+        self._question_start_time = 0
+        self._merge_result = []
+        self._right_indices = frozenset()
+        self._next_order: list[int] = None
+        self._ended = False
+        self._explained = False
+        self._answers_received = []
+
+        self._shuffle_answers()
+
+    @property
+    def quiz(self) -> Quiz:
+        return self._quiz
+
+    @property
+    def title(self) -> str:
+        return self._quiz.title
+    
+    @property
+    def questions(self) -> tuple:
+        return self._quiz.questions
+    
+    @property
+    def questions_count(self) -> int:
+        return self._quiz.questions_count
+
+    @property
+    def question_index(self) -> int:
+        return self._question_index
+
+    @property
+    def question(self) -> Question:
+        questions = self._quiz.questions
+        if self._question_index >= len(questions):
+            return questions[-1]
+        return questions[self._question_index]
+
+    @property
+    def answers(self) -> list:
+        return self._merge_result
+
+    @property
+    def answers_count(self) -> int:
+        return len(self._merge_result)
+
+    @property
+    def correct_answers_count(self) -> int:
+        return self._correct_answers_count
+
+    @property
+    def time_left(self) -> float:
+        return self.question.duration - (time() - self._question_start_time)
+
+    @time_left.setter
+    def time_left(self, value: float) -> None:
+        self._question_start_time = time()
+
+    @property
+    def ended(self) -> bool:
+        return self._ended
+
+    @property
+    def explained(self) -> bool:
+        return self._explained
+
+    def get_qs_total_time(self, in_str=False) -> int | str:
+        return self._quiz.get_qs_total_time(in_str)
+
+    def peek_next_answers(self) -> list:
+        """
+        Вернёт ответы следующего вопроса в том порядке, в котором их выдаст next_question.
+        Порядок перемешивается здесь один раз и запоминается до перехода.
+        """
+        index = self._question_index + 1
+        if index >= self._quiz.questions_count:
+            return []
+        right, wrong = self._quiz.questions[index].answers
+        answers = right + wrong
+        if self._next_order is None:
+            self._next_order = list(range(len(answers)))
+            random.shuffle(self._next_order)
+        return [answers[i] for i in self._next_order]
+
+    def _shuffle_answers(self) -> None:
+        right, wrong = self.question.answers
+        answers = right + wrong
+        order, self._next_order = self._next_order, None
+        if order is None or len(order) != len(answers):
+            order = list(range(len(answers)))
+            random.shuffle(order)
+        self._merge_result = [answers[i] for i in order]
+        self._right_indices = frozenset(index for index, source in enumerate(order) if source < len(right))
+
+    def _check_answer(self) -> None:
+        if time() - self._question_start_time > self.question.duration + 1:
+            return
+
+        correct = 0
+        wrong = 0
+        for answer in self._answers_received:
+            if type(answer) == int:
+                if answer in self._right_indices:
+                    correct += 1
+                else:
+                    wrong += 1
+            if type(answer) == str:
+                if self.question.is_right_input(answer):
+                    self._correct_answers_count += 1
+                else:
+                    wrong = 1
+        
+        if correct == len(self._right_indices) and wrong == 0:
+            self._correct_answers_count += 1
+
+    def get_answer(self, answer: int | str) -> None:
+        answer_type = type(answer)
+        answer_inputtable = self.question.inputtable
+
+        if (answer_type is int) and (not answer_inputtable)\
+        or (answer_type is str) and (answer_inputtable):
+            if answer in self._answers_received:
+                self._answers_received.remove(answer)
+            else:
+                self._answers_received.append(answer)
+
+    def next_question(self) -> None:
+        if self._ended: return
+
+        if self._question_index == self._quiz.questions_count - 1:
+            self._ended = True
+
+        self._check_answer()
+        self._question_index += 1
+        self._answers_received.clear()
+        self._question_start_time = time()
+        self._shuffle_answers()
+
+class QuizLoadResult:
+    """
+    Результат загрузки одного файла теста: сам тест (или None) и список найденных ошибок.
+    """
+    def __init__(self, path: str, quiz: Quiz = None, errors: list = None, header: list = None, terms: list = None) -> None:
+        self._path = path
+        self._quiz = quiz
+        self._errors = errors or []
+        self._header = header
+        self._terms = terms or []
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def quiz(self) -> Quiz | None:
+        return self._quiz
+
+    @property
+    def errors(self) -> list[str]:
+        return self._errors
+
+    @property
+    def header(self) -> list | None:
+        """
+        [название, число вопросов, общее время] или None, если тест не загрузился.
+        """
+        return self._header
+
+    @property
+    def terms(self) -> list[str]:
+        """
+        Слова из названия теста и заголовков вопросов для SearchIndex, без повторов.
+        """
+        return self._terms
+
+def _parse_quiz(file_source: dict) -> tuple[Quiz | None, list[str]]:
+    quiz_questions = []
+    errors = []
+
+    if not isinstance(file_source, dict):
+        return None, ["quiz file must contain a json object"]
+
+    if file_source == {}:
+        return None, ["file is empty or not a .json file"]
+
+    title = file_source.get("title")
+    questions = file_source.get("questions")
+    if questions == None or not isinstance(questions, list)\
+    or title == None or not isinstance(title, str):
+        return None, ["quiz must have a string 'title' and a list of 'questions'"]
+
+    for number, question in enumerate(questions, 1):
+        if not isinstance(question, dict) or not isinstance(question.get("answers"), dict):
+            errors.append(f"question {number}: 'answers' must be an object")
+            continue
+
+        text = question.get("title")
+        answers = question.get("answers")
+        right = answers.get("right")
+        wrong = answers.get("wrong")
+        duration = question.get("duration")
+        explain = question.get("explain")
+        inputtable = question.get("inputtable")
+        fuzzy = question.get("fuzzy", 0)
+
+        if not isinstance(text, str) or not isinstance(right, list) or not isinstance(wrong, list)\
+        or not isinstance(duration, int) or not isinstance(explain, str)\
+        or not isinstance(inputtable, bool)\
+        or not isinstance(fuzzy, int) or isinstance(fuzzy, bool) or fuzzy < 0:
+            errors.append(f"question {number}: invalid or missing fields")
+            continue
+
+        if not all(isinstance(answer, str) for answer in right + wrong):
+            errors.append(f"question {number}: answers must be strings")
+            continue
+
+        if len(right + wrong) > 4 or len(right + wrong) <= 0:
+            errors.append(f"question {number}: must have from 1 to 4 answers")
+            continue
+
+        quiz_questions.append(Question(text, [right, wrong], duration, explain, inputtable, fuzzy=fuzzy))
+
+    if not quiz_questions:
+        errors.append("quiz has no valid questions")
+        return None, errors
+    return Quiz(title, quiz_questions), errors
+
+def load_quiz_file(path: str, header_only: bool = False) -> QuizLoadResult:
+    try:
+        file_source = read_json(path)
+    except (OSError, ValueError) as error:
+        return QuizLoadResult(path, None, [str(error)])
+
+    quiz, errors = _parse_quiz(file_source)
+    if quiz is None:
+        return QuizLoadResult(path, None, errors)
+
+    header = [quiz.title, quiz.questions_count, quiz.get_qs_total_time()]
+    terms = set(get_search_terms(quiz.title))
+    for question in quiz.questions:
+        terms.update(get_search_terms(question.title))
+    return QuizLoadResult(path, None if header_only else quiz, errors, header, sorted(terms))
+
+def load_quizzes(paths: list[str], workers: int = None, header_only: bool = False) -> list[QuizLoadResult]:
+    """
+    Загрузит и проверит файлы тестов параллельно. Результаты идут в том же порядке, что и paths.
+    Небольшие наборы читаются в пуле потоков или сразу в главном потоке,
+    крупные разбираются в пуле процессов.
+    """
+    workers = workers or os.cpu_count() or 1
+    if len(paths) < QUIZ_LOAD_MIN_FILES or workers <= 1:
+        return [load_quiz_file(path, header_only) for path in paths]
+
+    # пулы импортируются только здесь, чтобы сам модуль загружался быстро
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    total_size = sum(os.path.getsize(path) for path in paths)
+    if total_size >= QUIZ_LOAD_PROCESS_BYTES:
+        executor = ProcessPoolExecutor(workers)
+    else:
+        executor = ThreadPoolExecutor(workers)
+
+    chunksize = max(1, len(paths) // (workers * 4))
+    with executor:
+        return list(executor.map(partial(load_quiz_file, header_only=header_only), paths, chunksize=chunksize))
+
+def get_quiz_files() -> list[str]:
+    return sorted(file for file in get_files_from(asset_path("data")) if file.endswith(".json"))
+
+class SearchIndex:
+    """
+    Обратный индекс по словам из названий тестов и вопросов. Для каждого слова хранится
+    битовая маска номеров тестов, поэтому объединение и пересечение - это | и & над int.
+    Слова запроса ищутся как префиксы: "geo" найдёт тесты со словом "geography".
+    """
+    def __init__(self) -> None:
+        self._postings: dict[str, int] = {}
+        self._words: list[str] = None
+        self._short_prefixes: dict[str, int] = None
+
+    def add(self, quiz_id: int, terms: list[str]) -> None:
+        bit = 1 << quiz_id
+        for term in terms:
+            self._postings[term] = self._postings.get(term, 0) | bit
+        self._words = None
+
+    def search(self, text: str) -> list[int] | None:
+        """
+        Вернёт номера тестов, где есть слова, начинающиеся с каждого слова запроса, по возрастанию.
+        Для пустого запроса вернёт None.
+        """
+        terms = get_search_terms(text)
+        if not terms:
+            return None
+
+        if self._words is None:
+            self.prepare()
+
+        mask = -1
+        for term in terms:
+            mask &= self._get_prefix_mask(term)
+            if not mask:
+                return []
+
+        bits = bin(mask)[:1:-1]
+        return [index for index, bit in enumerate(bits) if bit == "1"]
+
+    def prepare(self) -> None:
+        """
+        Отсортирует словарь и посчитает маски префиксов из 1-2 букв: под них попадает большая часть словаря.
+        Вызывается сам при первом поиске после add, но его можно вызвать заранее.
+        """
+        self._words = sorted(self._postings)
+        self._short_prefixes = {}
+        for word, mask in self._postings.items():
+            for length in (1, 2):
+                if len(word) >= length:
+                    prefix = word[:length]
+                    self._short_prefixes[prefix] = self._short_prefixes.get(prefix, 0) | mask
+
+    def _get_prefix_mask(self, prefix: str) -> int:
+        if len(prefix) <= 2:
+            return self._short_prefixes.get(prefix, 0)
+
+        mask = 0
+        for index in range(bisect_left(self._words, prefix), len(self._words)):
+            word = self._words[index]
+            if not word.startswith(prefix):
+                break
+            mask |= self._postings[word]
+        return mask
+
+def create_quizzes(reports: list = None, search: SearchIndex = None) -> list[Quiz]:
+    quizzes = []
+    paths = [asset_path(f"data\\{file}") for file in get_quiz_files()]
+    for result in load_quizzes(paths):
+        if reports is not None and result.errors:
+            reports.append(result)
+        if result.quiz is not None:
+            if search is not None:
+                search.add(len(quizzes), result.terms)
+            quizzes.append(result.quiz)
+    return quizzes
+
+class QuizInfo:
+    """
+    Заголовок теста для меню: название, число вопросов и общее время.
+    Сами вопросы читаются из файла только при вызове load().
+    """
+    def __init__(self, path: str, title: str, questions_count: int, total_time: int) -> None:
+        self._path = path
+        self._title = title
+        self._questions_count = questions_count
+        self._total_time = total_time
+        self._quiz: Quiz = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @property
+    def questions_count(self) -> int:
+        return self._questions_count
+
+    def get_qs_total_time(self, in_str=False) -> int | str:
+        return strftime("%H`%M`%S", gmtime(self._total_time)) if in_str else self._total_time
+
+    def load(self) -> Quiz:
+        if self._quiz is None:
+            self._quiz = load_quiz_file(self._path).quiz
+        return self._quiz
+
+def create_quiz_index(cache_path: str = QUIZ_INDEX_FILE, reports: list = None, search: SearchIndex = None) -> list[QuizInfo]:
+    """
+    Вернёт заголовки всех тестов из data и, если передан search, заполнит его словами тестов.
+    Заголовки и слова берутся из кэша на диске, файл разбирается заново
+    только если изменились его размер или время изменения.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        cache = {}
+
+    if cache.get("version") != QUIZ_INDEX_VERSION:
+        cache = {}
+
+    entries = cache.get("files", {})
+    new_entries = {}
+    changed = []
+
+    files = get_quiz_files()
+    for file in files:
+        stat = os.stat(asset_path(f"data\\{file}"))
+        entry = entries.get(file)
+        if entry is None or entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "quiz": None, "terms": []}
+            changed.append(file)
+        new_entries[file] = entry
+
+    results = load_quizzes([asset_path(f"data\\{file}") for file in changed], header_only=True)
+    for file, result in zip(changed, results):
+        new_entries[file]["quiz"] = result.header
+        new_entries[file]["terms"] = result.terms
+        if reports is not None and result.errors:
+            reports.append(result)
+
+    if new_entries != entries:
+        try:
+            with open(cache_path, "w", encoding="utf-8") as file:
+                json.dump({"version": QUIZ_INDEX_VERSION, "files": new_entries}, file, ensure_ascii=False)
+        except OSError:
+            pass
+
+    index = []
+    for file in files:
+        entry = new_entries[file]
+        if entry["quiz"] is not None:
+            if search is not None:
+                search.add(len(index), entry["terms"])
+            index.append(QuizInfo(asset_path(f"data\\{file}"), *entry["quiz"]))
+    return index
@@ -0,0 +1,227 @@
+import os
+import sys
+import mmap
+import struct
+from scripts.quizcore import Question, Quiz, QuizInfo, SearchIndex, load_quizzes
+from scripts.utils import asset_path, get_files_from
+from scripts.settings import QUIZ_PACK_FILE
+
+PACK_MAGIC = b"ATQP"
+PACK_VERSION = 4
+
+# magic, version, string count, quiz count, question count, term count, blob offset, quiz offset, question offset, term offset
+HEADER = struct.Struct("<4sHxxIIIIIIII")
+# title, first question, questions count, total time, first search term, search terms count
+QUIZ_RECORD = struct.Struct("<IIIIII")
+# title, explain, duration, inputtable, right count, wrong count, fuzzy distance, 4 answers, 4 normalized right answer keys
+QUESTION_RECORD = struct.Struct("<IIiBBBB4I4I")
+NO_STRING = 0xFFFFFFFF
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._strings: list[bytes] = []
+
+    def add(self, string: str) -> int:
+        if string not in self._ids:
+            self._ids[string] = len(self._strings)
+            self._strings.append(string.encode("utf-8"))
+        return self._ids[string]
+
+    def pack(self) -> tuple[bytes, bytes]:
+        offsets = [0]
+        for string in self._strings:
+            offsets.append(offsets[-1] + len(string))
+        return struct.pack(f"<{len(offsets)}I", *offsets), b"".join(self._strings)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+def compile_quiz_pack(paths: list[str], pack_path: str) -> list:
+    """
+    Соберёт тесты из json-файлов в один бинарный файл и вернёт результаты загрузки с ошибками.
+    Одинаковые строки хранятся один раз, правильные ответы хранятся уже нормализованными.
+    Слова для поиска по названиям теста и вопросов сохраняются списком номеров строк.
+    """
+    results = load_quizzes(paths)
+    strings = _StringTable()
+    quiz_records = []
+    question_records = []
+    terms = []
+
+    for result in results:
+        quiz = result.quiz
+        if quiz is None:
+            continue
+
+        quiz_records.append(QUIZ_RECORD.pack(strings.add(quiz.title), len(question_records), quiz.questions_count, quiz.get_qs_total_time(),
+                                             len(terms), len(result.terms)))
+        terms.extend(strings.add(term) for term in result.terms)
+        for question in quiz.questions:
+            right, wrong = question.answers
+            answers = [strings.add(answer) for answer in right + wrong]
+            keys = [strings.add(key) for key in question.answer_keys]
+            answers += [NO_STRING] * (4 - len(answers))
+            keys += [NO_STRING] * (4 - len(keys))
+            question_records.append(QUESTION_RECORD.pack(strings.add(question.title), strings.add(question.explain), question.duration,
+                                                         question.inputtable, len(right), len(wrong), min(question.fuzzy, 255), *answers, *keys))
+
+    offsets, blob = strings.pack()
+    blob_offset = HEADER.size + len(offsets)
+    quiz_offset = blob_offset + len(blob)
+    question_offset = quiz_offset + QUIZ_RECORD.size * len(quiz_records)
+    term_offset = question_offset + QUESTION_RECORD.size * len(question_records)
+
+    with open(pack_path, "wb") as file:
+        file.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(strings), len(quiz_records), len(question_records), len(terms),
+                               blob_offset, quiz_offset, question_offset, term_offset))
+        file.write(offsets)
+        file.write(blob)
+        file.write(b"".join(quiz_records))
+        file.write(b"".join(question_records))
+        file.write(struct.pack(f"<{len(terms)}I", *terms))
+
+    return results
+
+class QuizPack:
+    """
+    Файл, собранный compile_quiz_pack. Открывается через mmap, строки и вопросы
+    читаются только при обращении к конкретному тесту.
+    """
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._strings: dict[int, str] = {}
+
+        try:
+            magic, version, self._string_count, self._quiz_count, self._question_count, self._term_count,\
+            self._blob_offset, self._quiz_offset, self._question_offset, self._term_offset = HEADER.unpack_from(self._data, 0)
+        except struct.error:
+            magic, version = None, None
+
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a quiz pack of version {PACK_VERSION}")
+
+        sections = (HEADER.size + (self._string_count + 1) * 4, self._blob_offset, self._quiz_offset, self._quiz_offset + self._quiz_count * QUIZ_RECORD.size,
+                    self._question_offset, self._question_offset + self._question_count * QUESTION_RECORD.size, self._term_offset,
+                    self._term_offset + self._term_count * 4)
+        if list(sections) != sorted(sections) or sections[-1] > len(self._data):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self) -> int:
+        return self._quiz_count
+
+    def get_string(self, string_id: int) -> str:
+        string = self._strings.get(string_id)
+        if string is None:
+            self._check(string_id < self._string_count)
+            start, end = struct.unpack_from("<II", self._data, HEADER.size + string_id * 4)
+            self._check(start <= end <= self._quiz_offset - self._blob_offset)
+            try:
+                string = str(self._data[self._blob_offset + start:self._blob_offset + end], "utf-8")
+            except UnicodeDecodeError:
+                self._check(False)
+            self._strings[string_id] = string
+        return string
+
+    def _check(self, condition: bool) -> None:
+        """
+        Записи пакета читаются без проверок struct, поэтому любая ссылка за пределы
+        своей секции считается порчей файла и выдаётся как ValueError.
+        """
+        if not condition:
+            raise ValueError(f"{self._path} is corrupted")
+
+    def _get_quiz_record(self, index: int) -> tuple:
+        self._check(0 <= index < self._quiz_count)
+        return QUIZ_RECORD.unpack_from(self._data, self._quiz_offset + index * QUIZ_RECORD.size)
+
+    def get_header(self, index: int) -> list:
+        title, _first, questions_count, total_time, _first_term, _terms_count = self._get_quiz_record(index)
+        return [self.get_string(title), questions_count, total_time]
+
+    def get_terms(self, index: int) -> list[str]:
+        first_term, terms_count = self._get_quiz_record(index)[4:]
+        self._check(first_term + terms_count <= self._term_count)
+        term_ids = struct.unpack_from(f"<{terms_count}I", self._data, self._term_offset + first_term * 4)
+        return [self.get_string(term_id) for term_id in term_ids]
+
+    def load(self, index: int) -> Quiz:
+        title, first, questions_count = self._get_quiz_record(index)[:3]
+        self._check(first + questions_count <= self._question_count)
+        questions = []
+        for question_id in range(first, first + questions_count):
+            record = QUESTION_RECORD.unpack_from(self._data, self._question_offset + question_id * QUESTION_RECORD.size)
+            text, explain, duration, inputtable, right_count, wrong_count, fuzzy = record[:7]
+            self._check(right_count + wrong_count <= 4)
+            answers = [self.get_string(answer) for answer in record[7:7 + right_count + wrong_count]]
+            keys = [self.get_string(key) for key in record[11:15] if key != NO_STRING]
+            questions.append(Question(self.get_string(text), [answers[:right_count], answers[right_count:]],
+                                      duration, self.get_string(explain), bool(inputtable), keys, fuzzy))
+        return Quiz(self.get_string(title), questions)
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+class PackedQuizInfo(QuizInfo):
+    def __init__(self, pack: QuizPack, index: int) -> None:
+        super().__init__(None, *pack.get_header(index))
+        self._pack = pack
+        self._index = index
+
+    def load(self) -> Quiz:
+        if self._quiz is None:
+            try:
+                self._quiz = self._pack.load(self._index)
+            except ValueError:
+                return None
+        return self._quiz
+
+def is_pack_fresh(path: str = None) -> bool:
+    """
+    Пакет можно использовать, только если он новее папки data и всех тестов в ней:
+    иначе в нём нет добавленных или изменённых после сборки файлов.
+    В собранном exe пакет лежит рядом с той же копией data, из которой он собран,
+    а время изменения распакованных файлов ничего не значит.
+    """
+    path = path or asset_path(QUIZ_PACK_FILE)
+    if not os.path.exists(path):
+        return False
+    if hasattr(sys, "_MEIPASS"):
+        return True
+    data_path = asset_path("data")
+    pack_mtime = os.stat(path).st_mtime_ns
+    newest = max((os.stat(os.path.join(data_path, file)).st_mtime_ns for file in get_files_from(data_path) if file.endswith(".json")),
+                 default=0)
+    return pack_mtime >= max(newest, os.stat(data_path).st_mtime_ns)
+
+def create_pack_index(path: str = None, search: SearchIndex = None) -> list[QuizInfo]:
+    """
+    Вернёт заголовки тестов из файла пакета и, если передан search, заполнит его
+    словами тестов, сохранёнными при сборке пакета.
+    """
+    pack = QuizPack(path or asset_path(QUIZ_PACK_FILE))
+    index = [PackedQuizInfo(pack, quiz_id) for quiz_id in range(len(pack))]
+    if search is not None:
+        for quiz_id, quiz in enumerate(index):
+            search.add(quiz_id, pack.get_terms(quiz_id))
+    return index
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else asset_path("data")
+    target = sys.argv[2] if len(sys.argv) > 2 else QUIZ_PACK_FILE
+    paths = [os.path.join(source, file) for file in sorted(get_files_from(source)) if file.endswith(".json")]
+
+    results = compile_quiz_pack(paths, target)
+    for result in results:
+        for error in result.errors:
+            print(f"{result.path}: {error}")
+    print(f"{sum(result.quiz is not None for result in results)} of {len(results)} quizzes packed into {target}")
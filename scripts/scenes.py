@@ -1,5 +1,4 @@
 import pygame
-from copy import deepcopy
 from pygame.locals import *
 from scripts.objects import *
 from scripts.tween import *
@@ -7,26 +6,116 @@ from scripts.utils import *
 from scripts.questio import *
 from scripts.settings import *
 from scripts.timer import Timer
+from scripts.image import TransformCache
+from scripts.hittest import HitGroup
+from scripts.quizpack import create_pack_index, is_pack_fresh
 import time
 
 class Scene:
+    background: tuple | pygame.Surface = None
+
     def __init__(self, game) -> None:
         self.game = game
-        self.objects = pygame.sprite.Group()
+        self.objects = HitGroup()
+        self._background_image: pygame.Surface = None
+        self._drawn_sprites: dict = {}
+        self._redraw = True
+        self.actions: dict[str, callable] = {}
         self.ready()
     
     def ready(self) -> None:
         pass
     
     def update(self, delta: float) -> None:
+        self.objects.grid.update_hover(self.game.input.mouse_pos)
+        if self.game.profiler.enabled:
+            self.game.profiler.update_sprites(self.objects, delta)
+            return
         self.objects.update(delta)
 
     def render(self, surface: pygame.Surface) -> None:
+        if self.game.profiler.enabled:
+            self.game.profiler.draw_sprites(self.objects, surface)
+            return
         self.objects.draw(surface)
         for object in self.objects.sprites():
             if hasattr(object, "post_draw"):
                 object.post_draw(surface)
     
+    def redraw(self) -> None:
+        self._redraw = True
+
+    def render_dirty(self, surface: pygame.Surface) -> list[pygame.Rect]:
+        """
+        Перерисует только изменившиеся области экрана и вернёт их список для pygame.display.update.
+        Работает для сцен с неподвижным фоном (background), остальные рисуются целиком.
+        """
+        dirty = self._collect_dirty_rects()
+
+        if self._redraw:
+            self._redraw = False
+            self.render(surface)
+            return [surface.get_rect()]
+
+        background = self._get_background(surface)
+        sprites = self.objects.sprites()
+        rects = self._merge_rects(dirty, surface.get_rect())
+
+        for rect in rects:
+            surface.set_clip(rect)
+            surface.blit(background, rect, rect)
+            for sprite in sprites:
+                if sprite.rect.colliderect(rect):
+                    surface.blit(sprite.image, sprite.rect)
+            for sprite in sprites:
+                if hasattr(sprite, "post_draw"):
+                    sprite.post_draw(surface)
+        surface.set_clip(None)
+
+        return rects
+
+    def _collect_dirty_rects(self) -> list[pygame.Rect]:
+        dirty = []
+        drawn = {}
+
+        for sprite in self.objects.sprites():
+            image, rect = sprite.image, pygame.Rect(sprite.rect)
+            drawn[sprite] = (image, rect)
+            last = self._drawn_sprites.pop(sprite, None)
+
+            if last is None:
+                dirty.append(rect)
+            elif last[0] is not image or last[1] != rect or hasattr(sprite, "post_draw"):
+                dirty.append(rect)
+                dirty.append(last[1])
+
+        dirty.extend(rect for _image, rect in self._drawn_sprites.values())
+        self._drawn_sprites = drawn
+        return dirty
+
+    def _get_background(self, surface: pygame.Surface) -> pygame.Surface:
+        if self._background_image is None or self._background_image.get_size() != surface.get_size():
+            if isinstance(self.background, pygame.Surface):
+                self._background_image = self.background
+            else:
+                self._background_image = pygame.Surface(surface.get_size())
+                self._background_image.fill(self.background)
+        return self._background_image
+
+    @staticmethod
+    def _merge_rects(rects: list[pygame.Rect], bounds: pygame.Rect) -> list[pygame.Rect]:
+        merged = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect.w or not rect.h:
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
     def onEnter(self, *args) -> None:
         pass
 
@@ -41,38 +130,58 @@ class Intro(Scene):
         self.game.font.create("bubble_1", asset_path(f"{FONTS_DIR}Ramona-Light.ttf"), 28, BLACK, FONT_CENTER, True, 340)
         self.game.font.create("bubble_2", asset_path(f"{FONTS_DIR}Ramona-Light.ttf"), 24, BLACK, FONT_CENTER)
         self.game.font.create("menu_elem", asset_path(f"{FONTS_DIR}Ramona-Bold.ttf"), 24, WHITE, FONT_LEFT, True, 380)
-        self.game.image.load("logo", asset_path(f"{IMAGES_DIR}logo.png"))
-        self.game.image.load("hourglass", asset_path(f"{IMAGES_DIR}hourglass.png"))
-        self.game.image.load("etu", asset_path(f"{IMAGES_DIR}etu.png"))
-        self.game.audio.load("space", asset_path(f"{SOUNDS_DIR}answers_time.wav"))
-        self.game.audio.load("enter", asset_path(f"{SOUNDS_DIR}enter.wav"))
-        self.game.audio.load("escape", asset_path(f"{SOUNDS_DIR}escape.wav"))
-        self.game.audio.load("last_sec", asset_path(f"{SOUNDS_DIR}last_sec.wav"))
-        self.game.audio.load("time_up", asset_path(f"{SOUNDS_DIR}time_up.wav"))
+        for font in ("b16cW", "b28center", "bubble_1", "bubble_2", "menu_elem"):
+            self.game.loader.font(self.game.font.get(font))
+        self.game.loader.image("logo", asset_path(f"{IMAGES_DIR}logo.png"))
+        self.game.loader.image("hourglass", asset_path(f"{IMAGES_DIR}hourglass.png"))
+        self.game.loader.image("etu", asset_path(f"{IMAGES_DIR}etu.png"))
+        self.game.loader.sound("space", asset_path(f"{SOUNDS_DIR}answers_time.wav"))
+        self.game.loader.sound("enter", asset_path(f"{SOUNDS_DIR}enter.wav"))
+        self.game.loader.sound("escape", asset_path(f"{SOUNDS_DIR}escape.wav"))
+        self.game.loader.sound("last_sec", asset_path(f"{SOUNDS_DIR}last_sec.wav"))
+        self.game.loader.sound("time_up", asset_path(f"{SOUNDS_DIR}time_up.wav"))
+        self.game.loader.image("check", asset_path(f"{IMAGES_DIR}check.png"))
+        self.game.loader.image("wasd", asset_path(f"{IMAGES_DIR}wasd.png"))
+        self.game.loader.sound("answer_click", asset_path(f"{SOUNDS_DIR}answer_click.wav"))
+        self.game.loader.sound("answer_select", asset_path(f"{SOUNDS_DIR}answer_select.wav"))
+        self.game.loader.sound("quiz_ended", asset_path(f"{SOUNDS_DIR}quiz_ended.wav"))
+        self.game.loader.sound("quiz_start", asset_path(f"{SOUNDS_DIR}quiz_start.wav"))
+
+        self._starfield = VectorStarfield(self.game) if numpy else Starfield(self.game)
+        self._logo: ImageSprite = None
+        self._label_offset = vec2(0, 250)
 
+        self._timer0 = Timer(1, False)
+        self._show_ui = False
+        self._alpha_ui = 0
+        self._active = True
+
+        self.actions["back"] = self._on_back
+
+    def _on_back(self) -> None:
+        if self._logo is not None:
+            self.game.quit()
+
+    def _create_ui(self) -> None:
         screen_rect = self.game.screen.get_rect()
 
-        self._starfield = Starfield(self.game)
         self._logo = ImageSprite(self.game, pygame.transform.scale_by(self.game.image.get("logo").copy(), 1.5), screen_rect.center, "center")
         self._label = TextSprite(self.game, "Press any button to start", screen_rect.center + vec2(0, 250), "center", self.game.font.get("b16cW"))
         
         self._version_label = TextSprite(self.game, VER, screen_rect.bottomright - vec2(10, 10), "bottomright", self.game.font.get("b16cW"))
+        self._version_label.image = self._version_label.image.copy()
         self._version_label.image.set_alpha(150)
 
+        self._label.image = self._label.image.copy()
         self._logo.image.set_alpha(0)
         self._label.image.set_alpha(0)
-        self._label_offset = vec2(0, 250)
-
-        self._timer0 = Timer(1, False)
-        self._show_ui = False
-        self._alpha_ui = 0
-        self._active = True
 
     def _create_logo(self) -> None:
         if self._timer0.expired and not self._show_ui:
             self._show_ui = True
             self.objects.add(self._logo, self._label, self._version_label)
             self.game.audio.play("space", -1)
+            self.game.preload("Menu")
         
         if self._show_ui and self._alpha_ui < 255:
             self._alpha_ui += 5
@@ -81,24 +190,27 @@ class Intro(Scene):
             self._label.image.set_alpha(self._alpha_ui)
 
     def update(self, delta: float) -> None:
+        if self._logo is None:
+            self.game.profiler.call(self._starfield.update)
+            if self.game.loader.done:
+                self._create_ui()
+            return
+
         super().update(delta)
 
         self._create_logo()
 
-        self._starfield.update()
+        self.game.profiler.call(self._starfield.update)
 
         if self._active:
-            self._logo.position = self.game.screen.get_rect().center + (self.game.screen.get_rect().center - vec2(pygame.mouse.get_pos())) / 10
-            self._label.position = self.game.screen.get_rect().center + self._label_offset + ((self.game.screen.get_rect().center + self._label_offset) - vec2(pygame.mouse.get_pos())) / 10
+            self._logo.position = self.game.screen.get_rect().center + (self.game.screen.get_rect().center - vec2(self.game.input.mouse_pos)) / 10
+            self._label.position = self.game.screen.get_rect().center + self._label_offset + ((self.game.screen.get_rect().center + self._label_offset) - vec2(self.game.input.mouse_pos)) / 10
 
             if self._timer0.expired and 0 <= self._label.image.get_alpha() < 255:
                 alpha = self._label.image.get_alpha() + 6
                 alpha = min(alpha, 255)
                 self._label.image.set_alpha(alpha)
 
-            if self.game.input.is_key_pressed("escape"):
-                self.game.quit()
-            
             if self.game.input.is_anything_pressed():
                 if self._show_ui and self._alpha_ui >= 255:
                     self.game.change_scene("Menu")
@@ -111,87 +223,188 @@ class Intro(Scene):
 
     def render(self, surface: pygame.Surface) -> None:
         surface.fill(BLU_5)
-        self._starfield.render()
+        self.game.profiler.call(self._starfield.render)
+
+        if self._logo is None:
+            self._render_progress(surface)
 
         super().render(surface)
+
+    def _render_progress(self, surface: pygame.Surface) -> None:
+        rect = pygame.Rect(0, 0, 300, 4)
+        rect.midbottom = surface.get_rect().midbottom - vec2(0, 40)
+        pygame.draw.rect(surface, BLU_4, rect)
+        rect.w = round(rect.w * self.game.loader.progress)
+        pygame.draw.rect(surface, WHITE, rect)
     
     def onEnter(self) -> None:
         self._starfield.set_cursor_mode(True)
         self._active = True
-        self._logo.image.set_alpha(255)
         self._timer0.reset()
+        if self._logo:
+            self._logo.image.set_alpha(255)
 
     def onExit(self) -> None:
         self._starfield.set_cursor_mode(False)
         self._active = False
-        self._logo.image.set_alpha(80)
-        self._label.image.set_alpha(0)
+        if self._logo:
+            self._logo.image.set_alpha(80)
+            self._label.image.set_alpha(0)
 
 class Menu(Scene):
     def ready(self) -> None:
-        self._quizzes = create_quizzes()
+        self._quizzes = None
+        if is_pack_fresh():
+            try:
+                self._search = SearchIndex()
+                self._quizzes = create_pack_index(search=self._search)
+            except (OSError, ValueError):
+                self._quizzes = None
+        if self._quizzes is None:
+            self._search = SearchIndex()
+            self._quizzes = create_quiz_index(search=self._search)
+        self._search.prepare()
 
         #for i, quiz in enumerate(self.quizzes):
             #self.objects.add(TextSprite(self.game, quiz.title, (30, 30 + 30 * i), fontparams=self.game.font.get("b28center")))
 
         screen_rect = self.game.screen.get_rect()
-        self.objects.add(TextSprite(self.game, "Select a quiz", screen_rect.midtop + vec2(0, 20), "midtop", self.game.font.get("b28center")))
-
-        self._create_menu_elements()
-
-    def _create_menu_elements(self, start=vec2(30, 80), offset=vec2(10, 10)) -> None:
-        column, row = 0, 0
-        for index, quiz in enumerate(self._quizzes):
-            menu_element = QuizMenuBubble(self.game, quiz, index, anchor="topleft")
-            x = start.x + (menu_element.size.x + offset.x) * column
-            y = start.y + (menu_element.size.y + offset.y) * row
-            
-            column += 1
-            if column >= 3:
-                column, row = 0, row + 1
-
-            menu_element.position = (x, y)
+        self._title = TextSprite(self.game, "Select a quiz", screen_rect.midtop + vec2(0, 20), "midtop", self.game.font.get("b28center"))
+        self._search_box = InputBoxSprite(self.game, "Search", screen_rect.topright + vec2(-30, 30), "topright", self.game.font.get("b16cW"))
+        self._search_box.enabled = True
+        self._query = ""
+
+        self._start = vec2(30, 80)
+        self._cell = vec2(400, 300) + vec2(10, 10)
+        self._columns = 3
+        self._viewport = pygame.Rect(0, self._start.y, screen_rect.w, screen_rect.h - self._start.y)
+        self._cards: dict[int, QuizMenuBubble] = {}
+        self._free_cards: list[QuizMenuBubble] = []
+        self._broken: set[int] = set()
+        self._show_quizzes(list(range(len(self._quizzes))))
+
+        self.actions["back"] = self._on_back
+        self.actions["click"] = self._on_click
+        self.actions["scroll_up"] = lambda: self._scroll_by(-self._cell.y / 2)
+        self.actions["scroll_down"] = lambda: self._scroll_by(self._cell.y / 2)
+
+    def _show_quizzes(self, shown: list[int]) -> None:
+        self._shown = shown
+        rows = math.ceil(len(shown) / self._columns)
+        self._max_scroll = max(0, rows * self._cell.y - self._viewport.h)
+        self._scroll = 0
+        self._update_cards()
+
+    def _check_search(self) -> None:
+        if self._search_box.text != self._query:
+            self._query = self._search_box.text
+            shown = self._search.search(self._query)
+            shown = range(len(self._quizzes)) if shown is None else shown
+            self._show_quizzes([index for index in shown if index not in self._broken])
+
+    def _scroll_by(self, pixels: float) -> None:
+        scroll = min(max(self._scroll + pixels, 0), self._max_scroll)
+        if scroll != self._scroll:
+            self._scroll = scroll
+            self._update_cards()
+
+    def _update_cards(self, margin_rows: int = 1) -> None:
+        """
+        Держит карточки только для видимых рядов и margin_rows рядов вокруг них.
+        Карточки ушедших рядов не удаляются, а перерисовываются под тесты, которые появились.
+        Ряды строятся из self._shown - номеров тестов, прошедших поиск.
+        """
+        first_row = max(0, int(self._scroll // self._cell.y) - margin_rows)
+        last_row = int((self._scroll + self._viewport.h) // self._cell.y) + margin_rows
+        slots = range(first_row * self._columns, min(len(self._shown), (last_row + 1) * self._columns))
+        visible = {self._shown[slot]: slot for slot in slots}
+
+        for index in [index for index in self._cards if index not in visible]:
+            card = self._cards.pop(index)
+            self.objects.remove(card)
+            self._free_cards.append(card)
+
+        for index, slot in visible.items():
+            card = self._cards.get(index)
+            if card is None:
+                if self._free_cards:
+                    card = self._free_cards.pop()
+                    card.set_quiz(self._quizzes[index], index)
+                else:
+                    card = QuizMenuBubble(self.game, self._quizzes[index], index, anchor="topleft")
+                self._cards[index] = card
+                self.objects.add(card)
 
-            self.objects.add(menu_element)
+            row, column = divmod(slot, self._columns)
+            card.position = (self._start.x + self._cell.x * column, self._start.y + self._cell.y * row - self._scroll)
 
     def update(self, delta: float) -> None:
         self.game.scenes["Intro"].update(delta)
 
         super().update(delta)
-        
-        if self.game.input.is_key_pressed("escape"):
-            self.game.change_scene("Intro")
-            self.game.audio.play("escape")
 
-        if self.game.input.is_key_pressed("m_left"):
-            for index, sprite in enumerate(self.objects.sprites()):
-                if type(sprite) == QuizMenuBubble and sprite.mouse_in():
-                    self.game.change_scene("Quiz", deepcopy(self._quizzes[sprite.index]))
-                    self.game.audio.stop("space")
+        self._search_box.update(delta)
+        self._check_search()
+
+    def _on_back(self) -> None:
+        self.game.change_scene("Intro")
+        self.game.audio.play("escape")
+
+    def _on_click(self) -> None:
+        if not self._viewport.collidepoint(self.game.input.mouse_pos):
+            return
+
+        for sprite in self.objects.grid.at(self.game.input.mouse_pos):
+            if isinstance(sprite, QuizMenuBubble):
+                quiz = self._quizzes[sprite.index].load()
+                if quiz is None:
+                    self._drop_quiz(sprite.index)
+                    return
+                self.game.change_scene("Quiz", quiz.start())
+                self.game.audio.stop("space")
+                return
+
+    def _drop_quiz(self, index: int) -> None:
+        """
+        Уберёт из меню тест, файл которого пропал или перестал читаться после построения индекса.
+        """
+        self._broken.add(index)
+        self._shown = [shown for shown in self._shown if shown != index]
+        rows = math.ceil(len(self._shown) / self._columns)
+        self._max_scroll = max(0, rows * self._cell.y - self._viewport.h)
+        self._scroll = min(self._scroll, self._max_scroll)
+        self._update_cards()
+        self.game.audio.play("escape")
 
     def render(self, surface: pygame.Surface) -> None:
         self.game.scenes["Intro"].render(surface)
 
-        super().render(surface)    
+        surface.set_clip(self._viewport)
+        super().render(surface)
+        surface.set_clip(None)
+        surface.blit(self._title.image, self._title.rect)
+        surface.blit(self._search_box.image, self._search_box.rect)
+        self._search_box.post_draw(surface)
     
     def onEnter(self, *args) -> None:
         self.game.audio.play("enter")
+        self.game.preload("Quiz")
 
 class Quiz(Scene):
+    background = ALT_BLU_5
+
     def ready(self) -> None:
-        self._quiz: Quiz = None
+        self._quiz: QuizSession = None
         self._answer_sprites = set()
         self._endgame_objects = set()
+        self._prefetch = iter(())
+        self._next_index: int = None
+        self._next_sprites: list[pygame.sprite.Sprite] = []
 
         #self.font_params1 = FontParams(asset_path("assets\\fonts\\Ramona-Bold.ttf"), 28, (255, 255, 255), FONT_CENTER, wraplenth=1000)
         #self.font_params2 = FontParams(asset_path("assets\\fonts\\Ramona-Light.ttf"), 28, (0, 13, 44), FONT_CENTER, wraplenth=340)
         #self.font_params3 = FontParams(asset_path("assets\\fonts\\Ramona-Light.ttf"), 28, (0, 13, 44), FONT_CENTER)
         
-        self.game.audio.load("answer_click", asset_path("assets\\sounds\\answer_click.wav"))
-        self.game.audio.load("answer_select", asset_path("assets\\sounds\\answer_select.wav"))
-        self.game.audio.load("quiz_ended", asset_path("assets\\sounds\\quiz_ended.wav"))
-        self.game.audio.load("quiz_start", asset_path("assets\\sounds\\quiz_start.wav"))
-
         self._create_sprites()
 
         self._ended = False
@@ -201,32 +414,36 @@ class Quiz(Scene):
         self._tween1.play()
         self._tween2.play()
 
+        self.actions["back"] = lambda: self.game.change_scene("Menu")
+        self.actions["click"] = self._check_objects_under_mouse
+
     def _create_sprites(self) -> None:
         screen_rect = self.game.screen.get_rect()
 
         hourglass_image = self.game.image.get("hourglass")
         hourglass_rect = hourglass_image.get_rect()
         self._hourglass = ImageSprite(self.game, hourglass_image, screen_rect.bottomright - vec2(100, 100))
-        self._hg_img_copy = hourglass_image.copy()
+        self._hg_frames = TransformCache(hourglass_image.copy(), angle_step=0.5)
         self._hg_pos_copy = self._hourglass.position
         
         etu_image = self.game.image.get("etu")
         etu_rect = etu_image.get_rect()
         self._etu = ImageSprite(self.game, etu_image, screen_rect.bottomleft + vec2(100, -100))
-        self._etu_img_copy = etu_image.copy()
+        self._etu_frames = TransformCache(etu_image.copy())
+        self._etu_size = vec2(etu_rect.size)
         self._etu_pos_copy = self._etu.position
         
         self._timelabel = TextSprite(self.game, "", self._hourglass.position - vec2(0, hourglass_rect.h / 1.5), "center", self.game.font.get("b28center"))
 
         self.objects.add(self._hourglass, self._etu, self._timelabel)
 
-    def _get_points(self) -> list:
+    def _get_points(self, answers_count: int) -> list:
         points = []
         rect = self.game.screen.get_rect().center
         w, h = rect[0], rect[1]
         w_half, h_half = w / 2, h / 2
 
-        match self._quiz.answers_count:
+        match answers_count:
             case 2:
                 points.append([w_half + 125, h - 35])
                 points.append([w + w_half - 125, h - 35])
@@ -244,25 +461,36 @@ class Quiz(Scene):
 
         return points
 
-    def _create_ingame_ui(self) -> None:
-        Q = self._quiz.question
-        Qi = self._quiz.question_index
-        A = self._quiz.answers
+    def _build_question_ui(self, Qi: int, Q: Question, A: list):
+        """
+        Отдаёт спрайты вопроса по одному, чтобы _run_prefetch мог собирать следующий вопрос по частям.
+        """
         screen_rect = self.game.screen.get_rect()
-        points = self._get_points()
         nextbuttontext = "Next" if Qi + 1 != self._quiz.questions_count else "Complete"
 
-        self._timelabel.draw_text(str(self._quiz.question.duration - 1))
+        yield TextSprite(self.game, f"QUESTION {Qi + 1}", (screen_rect.centerx, 50), "center", self.game.font.get("b28center"))
+        yield TextSprite(self.game, Q.title, (screen_rect.centerx, 100), "center", self.game.font.get("b28center"))
+        yield QuizButtonBubble(self.game, nextbuttontext, (screen_rect.centerx, screen_rect.bottom - 80), self.game.font.get("bubble_1"))
 
-        self._answer_sprites.add(TextSprite(self.game, f"QUESTION {Qi + 1}", (screen_rect.centerx, 50), "center", self.game.font.get("b28center")))
-        self._answer_sprites.add(TextSprite(self.game, Q.title, (screen_rect.centerx, 100), "center", self.game.font.get("b28center")))
-        self._answer_sprites.add(QuizButtonBubble(self.game, nextbuttontext, (screen_rect.centerx, screen_rect.bottom - 80), self.game.font.get("bubble_1")))
-        
         if Q.inputtable:
-            self._answer_sprites.add(QuizInputBubble(self.game, "Enter your answer", screen_rect.center, self.game.font.get("bubble_2")))
+            yield QuizInputBubble(self.game, "Enter your answer", screen_rect.center, self.game.font.get("bubble_2"))
         else:
-            [self._answer_sprites.add(QuizTextBubble(self.game, i, a, points[i], self.game.font.get("bubble_1"))) for i, a in enumerate(A)]
-        
+            points = self._get_points(len(A))
+            for i, a in enumerate(A):
+                yield QuizTextBubble(self.game, i, a, points[i], self.game.font.get("bubble_1"))
+
+    def _create_ingame_ui(self) -> None:
+        Qi = self._quiz.question_index
+
+        if self._next_index == Qi:
+            self._answer_sprites.update(self._next_sprites)
+            self._answer_sprites.update(self._prefetch)
+        else:
+            self._answer_sprites.update(self._build_question_ui(Qi, self._quiz.question, self._quiz.answers))
+        self._next_index = None
+        self._next_sprites = []
+
+        self._timelabel.draw_text(str(self._quiz.question.duration - 1))
         self.objects.add(self._answer_sprites)
 
     def _create_endgame_ui(self) -> None:
@@ -286,6 +514,29 @@ class Quiz(Scene):
         self._answer_sprites.clear()
         self._endgame_objects.clear()
 
+    def _queue_prefetch(self) -> None:
+        """
+        Начнёт собирать спрайты следующего вопроса. Порядок его ответов перемешивается
+        заранее, и при переходе _create_ingame_ui просто подставит готовый набор.
+        """
+        self._next_sprites = []
+        index = self._quiz.question_index + 1
+        if index >= self._quiz.questions_count:
+            self._next_index = None
+            self._prefetch = iter(())
+            return
+
+        self._next_index = index
+        self._prefetch = self._build_question_ui(index, self._quiz.questions[index], self._quiz.peek_next_answers())
+
+    def _run_prefetch(self, budget: float = QUIZ_PREFETCH_BUDGET) -> None:
+        start = time.perf_counter()
+        while time.perf_counter() - start < budget:
+            sprite = next(self._prefetch, None)
+            if sprite is None:
+                return
+            self._next_sprites.append(sprite)
+
     def _refresh_ui(self) -> None:
         self._clear_quiz_ui()
 
@@ -294,6 +545,7 @@ class Quiz(Scene):
             self._create_ingame_ui()
             self._timelabel.draw_text(str(math.floor(self._quiz.time_left)))
             self._timer1.reset()
+            self._queue_prefetch()
 
             if self._quiz.ended:
                 self._ended = True
@@ -303,28 +555,30 @@ class Quiz(Scene):
                 self.game.audio.play("quiz_ended")
 
     def _check_objects_under_mouse(self) -> None:
-        for sprite in self.objects.sprites():
-            if sprite.rect.collidepoint(pygame.mouse.get_pos()):
-                if type(sprite) == QuizTextBubble and not self._quiz.ended:
-                    self._quiz.get_answer(sprite.answer_index)
+        if not self._quiz:
+            return
+
+        for sprite in self.objects.grid.at(self.game.input.mouse_pos):
+            if isinstance(sprite, QuizButtonBubble):
+                if not self._ended:
+                    self._get_answer_from_inputbox()
+                    self._refresh_ui()
                     self.game.audio.play("answer_click")
-                    sprite.checked = not sprite.checked
-                if type(sprite) == QuizButtonBubble:
-                    if not self._ended:
-                        self._get_answer_from_inputbox()
-                        self._refresh_ui()
-                        self.game.audio.play("answer_click")
-                    else:
-                        self.game.change_scene("Menu")
+                else:
+                    self.game.change_scene("Menu")
+            elif isinstance(sprite, QuizTextBubble) and not self._quiz.ended:
+                self._quiz.get_answer(sprite.answer_index)
+                self.game.audio.play("answer_click")
+                sprite.checked = not sprite.checked
 
     def update(self, delta: float) -> None:
         super().update(delta)
 
         self._tween1.update()
         self._tween2.update()
-        self._hourglass.image = pygame.transform.rotate(self._hg_img_copy, self._tween1.value)
+        self._hourglass.image = self._hg_frames.rotate(self._tween1.value)
         self._hourglass.position = self._hg_pos_copy - vec2(self._tween1.value / 2, 0)
-        self._etu.image = pygame.transform.scale(self._etu_img_copy, vec2(self._etu_img_copy.get_rect().size) - vec2(-self._tween2.value, self._tween2.value))
+        self._etu.image = self._etu_frames.scale(self._etu_size - vec2(-self._tween2.value, self._tween2.value))
         self._etu.position = self._etu_pos_copy + vec2(0, self._tween2.value)
 
         if self._timer1.expired and not self._ended:
@@ -338,11 +592,7 @@ class Quiz(Scene):
             self._refresh_ui()
             self.game.audio.play("time_up")
 
-        if self.game.input.is_key_pressed("escape"):
-            self.game.change_scene("Menu")
-
-        if self.game.input.is_key_pressed("m_left") and self._quiz:
-            self._check_objects_under_mouse()
+        self.game.profiler.call(self._run_prefetch)
 
     def render(self, surface: pygame.Surface) -> None:
         surface.fill(ALT_BLU_5)
@@ -353,11 +603,15 @@ class Quiz(Scene):
         self._quiz = args[0]
         self._quiz.time_left = time.time()
         self._create_ingame_ui()
+        self._queue_prefetch()
         self._timer1.reset()
         self.game.audio.play("quiz_start")
     
     def onExit(self) -> None:
         self._quiz = None
+        self._prefetch = iter(())
+        self._next_index = None
+        self._next_sprites = []
         self._ended = False
         self._clear_quiz_ui()
         self.game.audio.stop("quiz_start")
@@ -3,11 +3,36 @@ FPS = 30
 VER = "v1.0.0"
 SCREEN_SIZE = (1280, 720)
 BACK_COLOR = (62, 66, 75)
+DIRTY_RECTS = False
+TEXT_CACHE_BUDGET = 16 * 1024 * 1024
+PROFILER_KEY = "f3"
+PROFILER_TRACE_KEY = "f4"
+PROFILER_TRACE_FILE = "profile.jsonl"
+INPUT_BINDINGS = {
+    "back": ("escape",),
+    "click": ("m_left",),
+    "fullscreen": ("f11",),
+    "scroll_up": ("m_wheel_up", "up"),
+    "scroll_down": ("m_wheel_down", "down"),
+    "profiler": (PROFILER_KEY,),
+    "profiler_trace": (PROFILER_TRACE_KEY,),
+}
 
 IMAGES_DIR = "assets\\images\\"
 SOUNDS_DIR = "assets\\sounds\\"
 FONTS_DIR = "assets\\fonts\\"
 
+QUIZ_INDEX_FILE = "quiz_index.json"
+QUIZ_INDEX_VERSION = 2
+QUIZ_PACK_FILE = "quizzes.pack"
+QUIZ_LOAD_MIN_FILES = 32
+QUIZ_LOAD_PROCESS_BYTES = 4 * 1024 * 1024
+QUIZ_PREFETCH_BUDGET = 0.002
+
+BUBBLE_CACHE_DIR = "bubble_cache"
+BUBBLE_CACHE_VERSION = 1
+BUBBLE_VARIANTS = 8
+
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 BLU_0 = (224, 240, 255)
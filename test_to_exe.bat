@@ -1,7 +1,9 @@
-pyinstaller --noconfirm --onefile --windowed --icon "./icon.ico" --name "Answers Time" --add-data "./scripts;scripts/" --add-data "./assets;assets/" --add-data "./data;data/"  "./main.py"
+python -m scripts.quizpack "./data" "./quizzes.pack"
+pyinstaller --noconfirm --onefile --windowed --icon "./icon.ico" --name "Answers Time" --add-data "./scripts;scripts/" --add-data "./assets;assets/" --add-data "./data;data/" --add-data "./quizzes.pack;." "./main.py"
 md "./NewTest"
 copy "./icon.png" "./NewTest"
 copy "./dist" "./NewTest"
 rd "./dist" /s /Q
 rd "./build" /s /Q
-del "./Answers Time.spec" /Q
\ No newline at end of file
+del "./Answers Time.spec" /Q
+del "./quizzes.pack" /Q
\ No newline at end of file
@@ -0,0 +1,27 @@
+import unittest
+from scripts.quizcore import Question
+
+def make_question(right: list, fuzzy: int) -> Question:
+    return Question("Question", [right, []], inputtable=True, fuzzy=fuzzy)
+
+class FuzzyInputTest(unittest.TestCase):
+    def test_empty_input_is_wrong(self) -> None:
+        question = make_question(["ok"], 2)
+        self.assertFalse(question.is_right_input(""))
+        self.assertFalse(question.is_right_input("   "))
+
+    def test_tolerance_is_capped_by_answer_length(self) -> None:
+        question = make_question(["ok"], 2)
+        self.assertTrue(question.is_right_input("ok"))
+        self.assertTrue(question.is_right_input("oj"))
+        self.assertFalse(question.is_right_input("x"))
+        self.assertFalse(question.is_right_input("no"))
+
+    def test_long_answer_keeps_full_tolerance(self) -> None:
+        question = make_question(["washington"], 2)
+        self.assertTrue(question.is_right_input("Washingtn"))
+        self.assertTrue(question.is_right_input("vashingtn"))
+        self.assertFalse(question.is_right_input("vashngtn"))
+
+if __name__ == "__main__":
+    unittest.main()